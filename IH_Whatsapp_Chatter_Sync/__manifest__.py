@@ -8,6 +8,7 @@
     "depends": [
         "mail",
         "whatsapp",
+        "ih_graph_api",
     ],
     "installable": True,
 }
\ No newline at end of file
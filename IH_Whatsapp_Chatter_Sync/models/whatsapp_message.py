@@ -1,7 +1,11 @@
+from collections import defaultdict
+
 from odoo import api, models
 from odoo.tools import html2plaintext, html_escape
 from markupsafe import Markup
 
+from odoo.addons.ih_graph_api.tools import metrics
+
 
 class WhatsappMessage(models.Model):
     _inherit = "whatsapp.message"
@@ -10,25 +14,57 @@ class WhatsappMessage(models.Model):
         """Resolve the business document linked to an inbound WhatsApp message."""
         """" author: Mohamed Ebrahem """
         self.ensure_one()
-        mail_message = self.mail_message_id
-        if not mail_message or mail_message.model != "discuss.channel" or not mail_message.res_id:
-            return self.env["ir.model"]
+        return self._get_related_records_for_inbound().get(self.id, self.env["ir.model"])
+
+    def _get_related_records_for_inbound(self):
+        """Resolve the business documents linked to a batch of inbound messages.
+
+        Channels and documents are read with one query per model instead of
+        one chain of reads per message.
+
+        :return: ``{whatsapp.message id: record}`` for the messages that have one
+        """
+        channel_ids_by_msg = {}
+        for msg in self:
+            mail_message = msg.mail_message_id
+            if mail_message and mail_message.model == "discuss.channel" and mail_message.res_id:
+                channel_ids_by_msg[msg.id] = mail_message.res_id
+        if not channel_ids_by_msg:
+            return {}
 
-        channel = self.env["discuss.channel"].browse(mail_message.res_id).exists()
-        related_message = channel.whatsapp_mail_message_id
-        if not related_message or not related_message.model or not related_message.res_id:
-            return self.env["ir.model"]
+        channels = self.env["discuss.channel"].browse(set(channel_ids_by_msg.values())).exists()
+        channels.whatsapp_mail_message_id.fetch(["model", "res_id"])
+        doc_by_channel = {}
+        ids_by_model = defaultdict(set)
+        for channel in channels:
+            related_message = channel.whatsapp_mail_message_id
+            if related_message and related_message.model and related_message.res_id:
+                doc_by_channel[channel.id] = (related_message.model, related_message.res_id)
+                ids_by_model[related_message.model].add(related_message.res_id)
 
-        return self.env[related_message.model].browse(related_message.res_id).exists()
+        existing = {
+            model: set(self.env[model].browse(ids).exists().ids)
+            for model, ids in ids_by_model.items()
+        }
+        records = {}
+        for msg_id, channel_id in channel_ids_by_msg.items():
+            model, res_id = doc_by_channel.get(channel_id, (None, None))
+            if model and res_id in existing[model]:
+                records[msg_id] = self.env[model].browse(res_id)
+        return records
 
     @api.model_create_multi
     def create(self, vals_list):
         """" author: Mohamed Ebrahem """
         records = super().create(vals_list)
 
-        for msg in records:
-            if msg.message_type == "inbound":
-                record = msg._get_related_record_for_inbound()
+        inbound = records.filtered(lambda m: m.message_type == "inbound")
+        if not inbound:
+            return records
+        with metrics.measure("whatsapp.chatter_sync", self.env):
+            related = inbound._get_related_records_for_inbound()
+            for msg in inbound:
+                record = related.get(msg.id)
                 if record:
                     # Convert incoming HTML payload to text to avoid showing raw tags in chatter.
                     text_body = (html2plaintext(msg.body or "") or "").strip()
@@ -40,4 +76,4 @@ class WhatsappMessage(models.Model):
                         subtype_xmlid="mail.mt_note",
                     )
 
-        return records
\ No newline at end of file
+        return records
@@ -18,13 +18,14 @@ Long description of module's purpose
     'version': '0.1',
 
     # any module necessary for this one to work correctly
-    'depends': ['base','web','website_sale'],
+    'depends': ['base','web','website_sale','ih_meta_conversions_api'],
 
     # always loaded
     'data': [
         # 'security/ir.model.access.csv',
         'views/views.xml',
         'views/templates.xml',
+        'views/meta_event_relay_templates.xml',
     ],
     # only loaded in demonstration mode
     'demo': [
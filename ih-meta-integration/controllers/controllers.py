@@ -1,22 +1,87 @@
 # -*- coding: utf-8 -*-
-# from odoo import http
+import json
+import time
 
+from odoo import http
+from odoo.http import request
 
-# class Ih-meta-integration(http.Controller):
-#     @http.route('/ih-meta-integration/ih-meta-integration', auth='public')
-#     def index(self, **kw):
-#         return "Hello, world"
+from odoo.addons.ih_meta_conversions_api.tools import user_data as meta_user_data
 
-#     @http.route('/ih-meta-integration/ih-meta-integration/objects', auth='public')
-#     def list(self, **kw):
-#         return http.request.render('ih-meta-integration.listing', {
-#             'root': '/ih-meta-integration/ih-meta-integration',
-#             'objects': http.request.env['ih-meta-integration.ih-meta-integration'].search([]),
-#         })
+from ..tools.event_buffer import event_buffer
 
-#     @http.route('/ih-meta-integration/ih-meta-integration/objects/<model("ih-meta-integration.ih-meta-integration"):obj>', auth='public')
-#     def object(self, obj, **kw):
-#         return http.request.render('ih-meta-integration.object', {
-#             'object': obj
-#         })
+# Browser events relayed to the Conversions API (the server sends cart and Purchase events itself).
+RELAYED_EVENTS = ('ViewContent', 'InitiateCheckout')
+CUSTOM_DATA_KEYS = ('content_ids', 'contents', 'content_name', 'content_type', 'value', 'currency', 'num_items')
+MAX_BODY_SIZE = 16 * 1024
+MAX_EVENTS_PER_REQUEST = 20
 
+
+def _parse_events(body, now):
+    """Validate the events posted by the browser; return ``send_events`` items.
+
+    Unknown or incomplete events are skipped; None if ``body`` is malformed.
+    """
+    posted = body.get('events') if isinstance(body, dict) else None
+    if not isinstance(posted, list):
+        return None
+    events = []
+    for event in posted[:MAX_EVENTS_PER_REQUEST]:
+        if not isinstance(event, dict) or event.get('name') not in RELAYED_EVENTS:
+            continue
+        event_id = event.get('event_id')
+        if not isinstance(event_id, str) or not 0 < len(event_id) <= 64:
+            continue
+        custom_data = event.get('data') if isinstance(event.get('data'), dict) else {}
+        events.append({
+            'event_name': event['name'],
+            'event_id': event_id,
+            'event_time': now,
+            'event_source_url': str(event.get('url') or '')[:1024] or None,
+            'custom_data': {key: custom_data[key] for key in CUSTOM_DATA_KEYS if key in custom_data},
+        })
+    return events
+
+
+class MetaEventController(http.Controller):
+
+    @http.route('/meta/events', type='http', auth='public', methods=['POST'],
+                csrf=False, sitemap=False, save_session=False)
+    def ingest_events(self, **kw):
+        """Relay browser Pixel events to the Conversions API.
+
+        Body: ``{"events": [{"name", "event_id", "data", "url"}]}`` (sent with
+        ``navigator.sendBeacon``). Events are only buffered here; see
+        ``tools/event_buffer.py``. Answers 204 whatever the outcome, except for
+        malformed bodies (400) and a full buffer (429).
+        """
+        if not request.env['meta.conversions.api']._get_config().enabled:
+            return request.make_response('', status=204)
+        httprequest = request.httprequest
+        if (httprequest.content_length or 0) > MAX_BODY_SIZE:
+            return request.make_response('', status=400)
+        try:
+            body = json.loads(httprequest.get_data(cache=False) or b'{}')
+            events = _parse_events(body, int(time.time()))
+        except ValueError:
+            events = None
+        if events is None:
+            return request.make_response('', status=400)
+        if not events:
+            return request.make_response('', status=204)
+
+        user_data = meta_user_data.build_user_data(
+            None,
+            fbp=httprequest.cookies.get('_fbp'),
+            fbc=httprequest.cookies.get('_fbc'),
+            client_ip_address=httprequest.remote_addr,
+            client_user_agent=httprequest.user_agent.string,
+        )
+        referrer = httprequest.referrer
+        website_id = request.env['website'].get_current_website().id
+        for event in events:
+            event['website_id'] = website_id
+            event['user_data'] = user_data
+            event['event_source_url'] = event['event_source_url'] or referrer
+        if not event_buffer.add(request.db, events):
+            return request.make_response('', status=429)
+        return request.make_response('', status=204)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import time
+
+from odoo import models
+from odoo.http import request
+
+from odoo.addons.ih_graph_api.tools import metrics
+from odoo.addons.ih_meta_conversions_api.tools import user_data as meta_user_data
+
+from ..tools.event_buffer import event_buffer
+
+
+class SaleOrder(models.Model):
+    _inherit = 'sale.order'
+
+    def _cart_update_order_line(self, product_id, quantity, order_line, **kwargs):
+        """Also report the cart change to the Conversions API.
+
+        The changes of a cart line are netted for a few seconds in the
+        per-worker event buffer: ten clicks on +/- give one AddToCart (or
+        RemoveFromCart) event with the net quantity, or none at all. The
+        browser Pixel does not track AddToCart when this module is installed
+        (``server_events`` data island), so Meta counts each addition once.
+        RemoveFromCart is not a Meta standard event: it is reported as a
+        custom event.
+        """
+        old_quantity = order_line.product_uom_qty if order_line else 0
+        price = order_line.price_unit if order_line else 0
+        order_line = super()._cart_update_order_line(product_id, quantity, order_line, **kwargs)
+        if request and self.website_id:
+            if order_line:
+                price = order_line.price_unit
+            self._meta_capi_buffer_cart_change(product_id, max(quantity, 0) - old_quantity, price)
+        return order_line
+
+    def _meta_capi_buffer_cart_change(self, product_id, quantity, price):
+        self.ensure_one()
+        if not quantity or not self.env['meta.conversions.api']._get_config(self.website_id.id).enabled:
+            return
+        httprequest = request.httprequest
+        hashed = None
+        if self.partner_id != self.website_id.partner_id:
+            hashed = self.partner_id.sudo().meta_capi_user_data
+        user_data = meta_user_data.build_user_data(
+            hashed,
+            fbp=httprequest.cookies.get('_fbp'),
+            fbc=httprequest.cookies.get('_fbc'),
+            client_ip_address=httprequest.remote_addr,
+            client_user_agent=httprequest.user_agent.string,
+        )
+        order_id, website_id, currency = self.id, self.website_id.id, self.currency_id.name
+        url, event_time = httprequest.referrer, int(time.time())
+
+        def build(net):
+            event_name = 'AddToCart' if net > 0 else 'RemoveFromCart'
+            net = abs(net)
+            return {
+                'website_id': website_id,
+                'event_name': event_name,
+                'event_time': event_time,
+                'event_id': f'{event_name.lower()}_{order_id}_{product_id}_{event_time}',
+                'event_source_url': url,
+                'user_data': user_data,
+                'custom_data': {
+                    'content_ids': [product_id],
+                    'contents': [{'id': product_id, 'quantity': net, 'item_price': price}],
+                    'content_type': 'product',
+                    'num_items': net,
+                    'value': net * price,
+                    'currency': currency,
+                },
+                'res_model': 'sale.order',
+                'res_id': order_id,
+            }
+
+        if not event_buffer.merge(self.env.cr.dbname, ('cart', order_id, product_id), quantity, build):
+            metrics.record(self.env.cr.dbname, 'capi.cart_buffer', calls=0, errors=1)
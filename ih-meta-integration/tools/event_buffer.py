@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""Per-worker buffer of browser events waiting to be queued for the Conversions API.
+
+The ingestion route only appends to this buffer; a background thread moves
+the buffered events to the ``meta.capi.event`` outbox in one transaction per
+database every ``flush_interval`` seconds (or as soon as ``flush_size``
+events are waiting), so HTTP requests never wait on the database.
+
+Quantity changes can also be buffered with :meth:`EventBuffer.merge`: the
+changes made to the same key (e.g. a cart line) within ``coalesce_window``
+seconds are netted, and only the resulting event is queued.
+
+Events still buffered when a worker is killed (not when it exits normally)
+are lost; at most ``flush_interval`` seconds of events are at stake.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+from odoo import SUPERUSER_ID, api
+from odoo.modules.registry import Registry
+
+_logger = logging.getLogger(__name__)
+
+
+class EventBuffer:
+
+    def __init__(self, flush_size=200, flush_interval=1.0, max_size=10000, coalesce_window=10.0):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.coalesce_window = coalesce_window
+        self._events = defaultdict(list)
+        self._count = 0
+        # {(dbname, key): [release time, net quantity, build]}
+        self._changes = {}
+        self._condition = threading.Condition()
+        self._started = False
+        os.register_at_fork(after_in_child=self._forget)
+
+    def add(self, dbname, events):
+        """Buffer ``events`` (``send_events`` batch items) for database ``dbname``.
+
+        :return: False if the buffer is full and the events were dropped.
+        """
+        with self._condition:
+            if not self._started:
+                self._start()
+            if self._count + len(events) > self.max_size:
+                return False
+            self._events[dbname].extend(events)
+            self._count += len(events)
+            if self._count >= self.flush_size:
+                self._condition.notify()
+        return True
+
+    def merge(self, dbname, key, quantity, build):
+        """Buffer a change of ``quantity`` on ``key``, netted with its other changes.
+
+        The changes of ``key`` are released ``coalesce_window`` seconds after
+        the first one; ``build(net_quantity)`` is then called to make the
+        ``send_events`` item to queue (or None, e.g. when the changes cancel
+        out). The ``build`` of the latest change is used.
+
+        :return: False if the buffer is full and the change was dropped.
+        """
+        with self._condition:
+            if not self._started:
+                self._start()
+            change = self._changes.get((dbname, key))
+            if change is None:
+                if self._count + len(self._changes) >= self.max_size:
+                    return False
+                change = self._changes[(dbname, key)] = [time.monotonic() + self.coalesce_window, 0, None]
+            change[1] += quantity
+            change[2] = build
+        return True
+
+    def _forget(self):
+        # The parent's buffered events are its own to flush, and its flushing
+        # thread does not exist in a forked child.
+        self._condition = threading.Condition()
+        self._events = defaultdict(list)
+        self._count = 0
+        self._changes = {}
+        self._started = False
+
+    def _start(self):
+        self._started = True
+        thread = threading.Thread(target=self._run, name='meta_event_buffer', daemon=True)
+        thread.start()
+
+    def _drain(self, force=False):
+        """Take the buffered events, and the changes due (all of them if ``force``)."""
+        now = time.monotonic()
+        with self._condition:
+            events, self._events, self._count = self._events, defaultdict(list), 0
+            due = [key for key, change in self._changes.items() if force or change[0] <= now]
+            changes = [(key[0], self._changes.pop(key)) for key in due]
+        for dbname, (_release, net, build) in changes:
+            if not net:
+                continue
+            try:
+                event = build(net)
+            except Exception:
+                _logger.exception('Meta CAPI: could not build the event of a buffered change')
+                continue
+            if event:
+                events[dbname].append(event)
+        return events
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._count >= self.flush_size, self.flush_interval)
+            self.flush()
+
+    def flush(self, force=False):
+        """Queue the buffered events, one transaction per database.
+
+        :param force: also release the changes still within their window.
+        """
+        for dbname, events in self._drain(force).items():
+            threading.current_thread().dbname = dbname
+            try:
+                with Registry(dbname).cursor() as cr:
+                    env = api.Environment(cr, SUPERUSER_ID, {})
+                    env['meta.conversions.api'].send_events(events)
+            except Exception:
+                _logger.exception('Meta CAPI: could not queue %s browser event(s) for %s', len(events), dbname)
+
+
+event_buffer = EventBuffer()
+atexit.register(event_buffer.flush, force=True)
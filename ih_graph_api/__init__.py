@@ -0,0 +1,56 @@
+from odoo.tools import config
+
+from . import controllers
+from . import models
+from . import tools
+from .tools import dispatch, http_session, metrics, rate_limit
+
+
+def _configure_http_session():
+    """Apply the ``graph_*`` options of the Odoo configuration file.
+
+    Example::
+
+        [options]
+        graph_http_pool_connections = 10
+        graph_http_pool_maxsize = 20
+        graph_http_host_limits = graph.facebook.com:32
+        ; calls per second allowed per pixel / per WhatsApp phone number
+        graph_rate_limit_capi = 50
+        graph_rate_limit_whatsapp = 80
+        ; parallel outbound requests: pool threads, requests in flight per destination
+        graph_dispatch_workers = 16
+        graph_dispatch_per_destination = 4
+        ; load tests only: send Graph API calls to a mock server
+        graph_api_endpoint = http://127.0.0.1:8765
+        ; metrics: flush period (s), share of DEBUG traces kept, /graph_api/metrics token
+        graph_metrics_flush_interval = 30
+        graph_trace_sample_rate = 0.01
+        graph_metrics_token = <random string>
+    """
+    host_limits = {}
+    for item in (config.get("graph_http_host_limits") or "").split(","):
+        host, _sep, limit = item.strip().partition(":")
+        if host and limit:
+            host_limits[host] = int(limit)
+    http_session.configure(
+        pool_connections=int(config.get("graph_http_pool_connections") or http_session.DEFAULT_POOL_CONNECTIONS),
+        pool_maxsize=int(config.get("graph_http_pool_maxsize") or http_session.DEFAULT_POOL_MAXSIZE),
+        host_limits=host_limits,
+        graph_endpoint=config.get("graph_api_endpoint") or False,
+    )
+    rate_limit.configure_rates(
+        capi=config.get("graph_rate_limit_capi"),
+        whatsapp=config.get("graph_rate_limit_whatsapp"),
+    )
+    dispatch.configure(
+        workers=config.get("graph_dispatch_workers"),
+        per_destination=config.get("graph_dispatch_per_destination"),
+    )
+    metrics.configure(
+        flush_interval=config.get("graph_metrics_flush_interval"),
+        trace_sample_rate=config.get("graph_trace_sample_rate"),
+    )
+
+
+_configure_http_session()
@@ -0,0 +1,30 @@
+{
+    "name": "Meta Graph API Transport",
+    "summary": "Shared, pooled HTTP transport for Meta Graph API calls (Conversions API, WhatsApp).",
+    "description": """
+Shared plumbing for the modules talking to graph.facebook.com.
+
+Features
+========
+- Process-wide registry of keep-alive HTTP sessions with connection pooling
+- Pool sizes and per-host connection limits configurable from the Odoo config file
+- Sessions are dropped after fork and closed when the worker exits
+- Per-destination token buckets driven by Meta's usage headers, backoff with jitter
+- Bounded-concurrency dispatch of outbound requests, outside the database cursor
+- Hot-path metrics (calls, errors, time, SQL queries per stage), Prometheus endpoint
+- Day-partitioned, compressed log of the events sent and of their responses
+    """,
+    "author": "Mohamed Ebrahem",
+    "category": "Technical",
+    "version": "17.0.1.0.0",
+    "license": "LGPL-3",
+    "depends": ["base"],
+    "data": [
+        "security/ir.model.access.csv",
+        "data/ir_cron_data.xml",
+        "views/graph_api_metric_views.xml",
+        "views/graph_api_event_log_views.xml",
+    ],
+    "installable": True,
+    "application": False,
+}
@@ -0,0 +1,30 @@
+import hmac
+
+from odoo import http
+from odoo.http import request
+from odoo.tools import config
+
+from ..tools import metrics
+
+
+class GraphApiMetrics(http.Controller):
+
+    @http.route("/graph_api/metrics", type="http", auth="public", methods=["GET"],
+                sitemap=False, save_session=False)
+    def graph_api_metrics(self, token=None, **kw):
+        """Prometheus scrape target.
+
+        Disabled unless ``graph_metrics_token`` is set in the configuration
+        file; the token is passed as ``Authorization: Bearer <token>`` or
+        ``?token=<token>``.
+        """
+        expected = config.get("graph_metrics_token")
+        auth = request.httprequest.headers.get("Authorization", "")
+        given = token or (auth[7:] if auth.startswith("Bearer ") else "")
+        if not expected or not hmac.compare_digest(given.encode(), expected.encode()):
+            raise request.not_found()
+        rows = request.env["graph.api.metric"].sudo()._snapshot()
+        return request.make_response(
+            metrics.render_prometheus(rows),
+            headers=[("Content-Type", "text/plain; version=0.0.4; charset=utf-8")],
+        )
@@ -0,0 +1,2 @@
+from . import graph_api_metric
+from . import graph_api_event_log
@@ -0,0 +1,177 @@
+import json
+import logging
+import zlib
+from datetime import date, timedelta
+
+import psycopg2
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+# Days of log kept by default (system parameter ih_graph_api.event_log_retention_days)
+DEFAULT_RETENTION_DAYS = 30
+# Daily partitions created in advance by the maintenance cron
+PARTITIONS_AHEAD = 3
+PARTITION_PREFIX = "graph_api_event_log_p"
+
+# (dbname, day) of the partitions known to exist, per process
+_known_partitions = set()
+
+
+def _compress(value):
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        value = json.dumps(value, separators=(",", ":"), default=str)
+    return psycopg2.Binary(zlib.compress(value.encode()))
+
+
+def _decompress(value):
+    return zlib.decompress(bytes(value)).decode() if value is not None else False
+
+
+class GraphApiEventLog(models.Model):
+    """Append-only log of the payloads sent to Meta and of their responses.
+
+    The table is partitioned by day on ``date``: the maintenance cron creates
+    the partitions ahead and drops whole partitions past the retention period,
+    so no row is ever deleted one by one. Payloads and responses are stored
+    zlib-compressed (``payload`` / ``response`` bytea columns, not ORM fields).
+
+    Lookups by ``event_id`` or by record (``res_model``, ``res_id``) use the
+    per-partition indexes; add a ``date`` condition to search fewer partitions.
+    """
+
+    _name = "graph.api.event.log"
+    _description = "Graph API Event Log"
+    _order = "date desc, id desc"
+    _auto = False
+    _log_access = False
+
+    date = fields.Datetime(readonly=True)
+    channel = fields.Selection(
+        [("capi", "Conversions API"), ("whatsapp", "WhatsApp")], readonly=True
+    )
+    res_model = fields.Char(string="Model", readonly=True)
+    res_id = fields.Many2oneReference(string="Record ID", model_field="res_model", readonly=True)
+    event_id = fields.Char(string="Event ID", readonly=True)
+    destination = fields.Char(readonly=True, help="Pixel ID or phone number.")
+    status_code = fields.Integer(readonly=True)
+    ok = fields.Boolean(string="Success", readonly=True)
+    payload_text = fields.Text(string="Payload", compute="_compute_texts")
+    response_text = fields.Text(string="Response", compute="_compute_texts")
+
+    def init(self):
+        cr = self.env.cr
+        cr.execute("""
+            CREATE TABLE IF NOT EXISTS graph_api_event_log (
+                id bigserial NOT NULL,
+                date timestamp NOT NULL,
+                channel varchar NOT NULL,
+                res_model varchar,
+                res_id int4,
+                event_id varchar,
+                destination varchar,
+                status_code int4,
+                ok boolean,
+                payload bytea,
+                response bytea,
+                PRIMARY KEY (id, date)
+            ) PARTITION BY RANGE (date)
+        """)
+        cr.execute("""
+            CREATE INDEX IF NOT EXISTS graph_api_event_log_event_id_index
+                ON graph_api_event_log (event_id) WHERE event_id IS NOT NULL
+        """)
+        cr.execute("""
+            CREATE INDEX IF NOT EXISTS graph_api_event_log_res_index
+                ON graph_api_event_log (res_model, res_id) WHERE res_id IS NOT NULL
+        """)
+        self._create_partitions(fields.Datetime.now().date())
+
+    def _compute_texts(self):
+        self.env.cr.execute(
+            "SELECT id, payload, response FROM graph_api_event_log WHERE id = ANY(%s)", [self.ids]
+        )
+        texts = {row[0]: row[1:] for row in self.env.cr.fetchall()}
+        for log in self:
+            payload, response = texts.get(log.id, (None, None))
+            log.payload_text = _decompress(payload)
+            log.response_text = _decompress(response)
+
+    @api.model
+    def _log(self, entries):
+        """Append ``entries`` to the log in a single INSERT.
+
+        Each entry is a dict with ``channel`` and any of ``res_model``,
+        ``res_id``, ``event_id``, ``destination``, ``status_code``, ``ok``,
+        ``payload`` and ``response`` (strings, or values serialized to JSON).
+        A failure to log is only reported: it never fails the send.
+        """
+        if not entries:
+            return
+        now = fields.Datetime.now()
+        rows = [(
+            now, entry["channel"], entry.get("res_model"), entry.get("res_id"), entry.get("event_id"),
+            entry.get("destination"), entry.get("status_code"), entry.get("ok"),
+            _compress(entry.get("payload")), _compress(entry.get("response")),
+        ) for entry in entries]
+        partition = (self.env.cr.dbname, now.date())
+        try:
+            with self.env.cr.savepoint(flush=False):
+                if partition not in _known_partitions:
+                    self._create_partitions(now.date(), 0)
+                self.env.cr.execute(
+                    """
+                    INSERT INTO graph_api_event_log
+                           (date, channel, res_model, res_id, event_id, destination, status_code, ok, payload, response)
+                    VALUES %s
+                    """ % ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"] * len(rows)),
+                    [item for row in rows for item in row],
+                )
+            _known_partitions.add(partition)
+        except Exception:
+            # e.g. the partition was created by a transaction since rolled back
+            _known_partitions.discard(partition)
+            _logger.warning("Could not write %s entries to the Graph API event log", len(rows), exc_info=True)
+
+    def _create_partitions(self, first_day, ahead=PARTITIONS_AHEAD):
+        """Create the daily partitions from ``first_day`` to ``ahead`` days later."""
+        for offset in range(ahead + 1):
+            day = first_day + timedelta(days=offset)
+            self.env.cr.execute(
+                "CREATE TABLE IF NOT EXISTS %s%s PARTITION OF graph_api_event_log FOR VALUES FROM (%%s) TO (%%s)"
+                % (PARTITION_PREFIX, day.strftime("%Y%m%d")),
+                [day, day + timedelta(days=1)],
+            )
+
+    def _partition_days(self):
+        """``{day: partition name}`` of the existing partitions."""
+        self.env.cr.execute("""
+            SELECT c.relname
+              FROM pg_inherits i
+              JOIN pg_class c ON c.oid = i.inhrelid
+             WHERE i.inhparent = 'graph_api_event_log'::regclass
+        """)
+        days = {}
+        for (name,) in self.env.cr.fetchall():
+            try:
+                days[date(int(name[-8:-4]), int(name[-4:-2]), int(name[-2:]))] = name
+            except ValueError:
+                continue
+        return days
+
+    @api.model
+    def _cron_maintain_partitions(self):
+        """Create the coming days' partitions and drop those past retention."""
+        today = fields.Datetime.now().date()
+        self._create_partitions(today)
+        retention = int(self.env["ir.config_parameter"].sudo().get_param(
+            "ih_graph_api.event_log_retention_days", DEFAULT_RETENTION_DAYS
+        ))
+        oldest = today - timedelta(days=retention)
+        for day, name in sorted(self._partition_days().items()):
+            if day < oldest:
+                self.env.cr.execute("DROP TABLE IF EXISTS %s" % name)
+                _logger.info("Graph API event log: dropped partition %s", name)
@@ -0,0 +1,65 @@
+from odoo import api, fields, models
+
+
+class GraphApiMetric(models.Model):
+    """Totals of the hot-path counters of all workers, one row per stage.
+
+    Rows are only ever incremented, by the flushing thread of each process
+    (see ``tools/metrics.py``). Counters are double precision rather than
+    integers: int4 columns would overflow within weeks at high volume.
+    """
+
+    _name = "graph.api.metric"
+    _description = "Graph API Integration Metric"
+    _order = "stage"
+    _rec_name = "stage"
+    _log_access = False
+
+    stage = fields.Char(required=True, readonly=True)
+    call_count = fields.Float(string="Calls", readonly=True)
+    error_count = fields.Float(string="Errors", readonly=True)
+    duration = fields.Float(string="Total Time (s)", readonly=True)
+    query_count = fields.Float(string="SQL Queries", readonly=True)
+    avg_duration_ms = fields.Float(string="Avg Time (ms)", compute="_compute_averages")
+    avg_query_count = fields.Float(string="Avg Queries", compute="_compute_averages")
+    last_update = fields.Datetime(readonly=True)
+
+    _sql_constraints = [
+        ("stage_uniq", "unique(stage)", "One row per stage."),
+    ]
+
+    @api.depends("call_count", "duration", "query_count")
+    def _compute_averages(self):
+        for metric in self:
+            calls = metric.call_count or 1
+            metric.avg_duration_ms = 1000 * metric.duration / calls
+            metric.avg_query_count = metric.query_count / calls
+
+    @api.model
+    def _add_counters(self, counters):
+        """Add ``{stage: [calls, errors, seconds, queries]}`` to the totals."""
+        if not counters:
+            return
+        values = [(stage, *values) for stage, values in counters.items()]
+        self.env.cr.execute(
+            """
+            INSERT INTO graph_api_metric AS m (stage, call_count, error_count, duration, query_count, last_update)
+                 SELECT v.*, now() at time zone 'UTC'
+                   FROM (VALUES %s) AS v(stage, call_count, error_count, duration, query_count)
+            ON CONFLICT (stage) DO UPDATE
+                    SET call_count = m.call_count + EXCLUDED.call_count,
+                        error_count = m.error_count + EXCLUDED.error_count,
+                        duration = m.duration + EXCLUDED.duration,
+                        query_count = m.query_count + EXCLUDED.query_count,
+                        last_update = EXCLUDED.last_update
+            """ % ", ".join(["(%s, %s::float8, %s::float8, %s::float8, %s::float8)"] * len(values)),
+            [item for row in values for item in row],
+        )
+
+    @api.model
+    def _snapshot(self):
+        """``[(stage, calls, errors, seconds, queries)]``, ordered by stage."""
+        self.env.cr.execute(
+            "SELECT stage, call_count, error_count, duration, query_count FROM graph_api_metric ORDER BY stage"
+        )
+        return self.env.cr.fetchall()
@@ -0,0 +1,51 @@
+import threading
+import time
+from collections import Counter
+
+from odoo.tests.common import BaseCase
+
+from odoo.addons.ih_graph_api.tools import dispatch
+
+
+class TestDispatch(BaseCase):
+
+    def test_empty(self):
+        self.assertEqual(dispatch.run([]), [])
+
+    def test_results_in_order(self):
+        def job(value):
+            time.sleep(0.01 * (value % 3))
+            return value * 2
+
+        jobs = [(value % 4, lambda value=value: job(value)) for value in range(20)]
+        self.assertEqual(dispatch.run(jobs), [(value * 2, None) for value in range(20)])
+
+    def test_exceptions_are_returned(self):
+        error = ValueError("boom")
+
+        def fail():
+            raise error
+
+        self.assertEqual(
+            dispatch.run([("a", lambda: 1), ("a", fail), ("b", lambda: 3)]),
+            [(1, None), (None, error), (3, None)],
+        )
+
+    def test_single_job_runs_inline(self):
+        self.assertEqual(dispatch.run([("a", threading.get_ident)]), [(threading.get_ident(), None)])
+
+    def test_per_destination_limit(self):
+        lock = threading.Lock()
+        running, peak = Counter(), Counter()
+
+        def job(destination):
+            with lock:
+                running[destination] += 1
+                peak[destination] = max(peak[destination], running[destination])
+            time.sleep(0.02)
+            with lock:
+                running[destination] -= 1
+
+        jobs = [(destination, lambda d=destination: job(d)) for destination in "ab" * 8]
+        dispatch.run(jobs, per_destination=2)
+        self.assertLessEqual(max(peak.values()), 2)
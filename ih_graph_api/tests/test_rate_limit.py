@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+from odoo.tests.common import BaseCase
+
+from odoo.addons.ih_graph_api.tools import rate_limit
+from odoo.addons.ih_graph_api.tools.rate_limit import TokenBucket, backoff_delay
+
+
+class TestBackoff(BaseCase):
+
+    def test_bounds(self):
+        for attempt, full in ((0, 10), (1, 20), (3, 80), (10, 100)):
+            for _i in range(20):
+                delay = backoff_delay(attempt, base=10, cap=100)
+                self.assertGreaterEqual(delay, full / 2)
+                self.assertLessEqual(delay, full)
+
+    def test_retry_after(self):
+        self.assertEqual(backoff_delay(0, base=1, cap=10, retry_after=30), 30)
+
+
+class TestTokenBucket(BaseCase):
+
+    def setUp(self):
+        super().setUp()
+        self.now = 1000.0
+        patcher = patch.object(rate_limit.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_then_refill(self):
+        bucket = TokenBucket(rate=10)
+        for _i in range(10):
+            self.assertTrue(bucket.acquire(max_wait=0))
+        self.assertAlmostEqual(bucket.wait_time(), 0.1)
+        self.now += 0.5
+        self.assertEqual(bucket.wait_time(5), 0)
+        self.now += 10
+        # refill is capped at the capacity
+        self.assertAlmostEqual(bucket.wait_time(11), 0.1)
+
+    def test_max_wait_reserves_nothing(self):
+        bucket = TokenBucket(rate=1)
+        self.assertTrue(bucket.acquire(max_wait=0))
+        self.assertFalse(bucket.acquire(max_wait=0.5))
+        self.assertAlmostEqual(bucket.wait_time(), 1)
+
+    def test_observe(self):
+        bucket = TokenBucket(rate=10)
+        bucket.observe(usage=100)
+        self.assertAlmostEqual(bucket.rate, 1)
+        bucket.observe(usage=50, pause=30)
+        self.assertEqual(bucket.rate, 10)
+        self.assertAlmostEqual(bucket.wait_time(), 30)
+        self.assertFalse(bucket.acquire(max_wait=10))
+
+
+class TestUsage(BaseCase):
+
+    def test_parse_usage(self):
+        headers = {
+            "X-App-Usage": '{"call_count": 12, "total_time": 40}',
+            "X-Business-Use-Case-Usage":
+                '{"123": [{"call_count": 80, "estimated_time_to_regain_access": 2}]}',
+        }
+        self.assertEqual(rate_limit.parse_usage(headers), (80, 120))
+        self.assertEqual(rate_limit.parse_usage({"X-App-Usage": "garbage"}), (0, 0))
+
+    def test_is_retryable(self):
+        self.assertTrue(rate_limit.is_retryable(None))
+        self.assertTrue(rate_limit.is_retryable(503))
+        self.assertTrue(rate_limit.is_retryable(429))
+        self.assertTrue(rate_limit.is_retryable(400, 613))
+        self.assertFalse(rate_limit.is_retryable(400, 100))
@@ -0,0 +1,4 @@
+from . import dispatch
+from . import http_session
+from . import metrics
+from . import rate_limit
@@ -0,0 +1,77 @@
+"""Benchmark: throughput of ``dispatch.run`` by concurrency, against the mock Graph API.
+
+Run it from ``odoo-bin shell`` (no database access is needed)::
+
+    from odoo.addons.ih_graph_api.tools import bench_dispatch
+    bench_dispatch.run(requests_count=400, destinations=4, latency=0.1)
+
+Each request is one Conversions API ``/events`` call, paced by its pixel's
+token bucket like ``post_events`` does. With ``rate=None`` the rate limits do
+not bind and throughput grows with the concurrency per destination (about
+``destinations * concurrency / latency`` requests/s); with a ``rate`` (calls
+per second per pixel) it levels off at ``destinations * rate``.
+"""
+import time
+from functools import partial
+
+from . import dispatch, http_session, rate_limit
+from .graph_mock_server import MockGraphServer
+
+
+def _post(url):
+    payload = {"data": [{
+        "event_name": "Purchase",
+        "event_time": int(time.time()),
+        "action_source": "website",
+        "user_data": {"em": "0" * 64},
+    }]}
+    response = http_session.get_session("bench").post(
+        url, json=payload, params={"access_token": "bench"}, timeout=5
+    )
+    return response.status_code
+
+
+def _job(server, pixel_id):
+    destination = rate_limit.bucket("capi", pixel_id)
+    destination.acquire()
+    return _post(f"{server.url}/v17.0/{pixel_id}/events")
+
+
+def _measure(server, requests_count, destinations, concurrency, rate):
+    rate_limit.configure_rates(capi=rate or 1_000_000)
+    dispatch.configure(workers=destinations * concurrency, per_destination=concurrency)
+    pixels = [str(1000 + i) for i in range(destinations)]
+    jobs = [(pixel, partial(_job, server, pixel)) for pixel in (pixels * requests_count)[:requests_count]]
+    start = time.perf_counter()
+    results = dispatch.run(jobs)
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": round(elapsed, 3),
+        "req_per_s": round(requests_count / elapsed, 1),
+        "errors": sum(1 for status, error in results if error or status != 200),
+    }
+
+
+def run(requests_count=400, destinations=4, latency=0.1, concurrency_levels=(1, 2, 4, 8, 16), rate=None):
+    """Print and return ``{concurrency: {seconds, req_per_s, errors}}``."""
+    http_session.configure(pool_maxsize=destinations * max(concurrency_levels))
+    results = {}
+    with MockGraphServer(latency=latency, jitter=0.05) as server:
+        for concurrency in concurrency_levels:
+            results[concurrency] = _measure(server, requests_count, destinations, concurrency, rate)
+    http_session.close_all()
+    rate_limit.configure_rates(**rate_limit.DEFAULT_RATES)
+    dispatch.configure(workers=dispatch.DEFAULT_WORKERS, per_destination=dispatch.DEFAULT_PER_DESTINATION)
+
+    limit = f"{rate} calls/s per pixel" if rate else "no rate limit"
+    print(f"{requests_count} requests to {destinations} pixels, latency {latency}s, {limit}")
+    for concurrency, res in results.items():
+        print(
+            f"  {concurrency:>3} per destination {res['seconds']:>7}s "
+            f"{res['req_per_s']:>9} req/s {res['errors']:>5} errors"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    run()
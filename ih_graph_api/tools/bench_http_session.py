@@ -0,0 +1,64 @@
+"""Benchmark: pooled session vs. one-shot ``requests.post`` against the mock Graph API.
+
+Run it from ``odoo-bin shell`` (no database access is needed)::
+
+    from odoo.addons.ih_graph_api.tools import bench_http_session
+    bench_http_session.run(requests_count=500, concurrency=8, connect_delay=0.02)
+
+It prints, for each client, the wall time, the requests per second and the
+number of TCP connections the mock server had to accept. ``connect_delay``
+stands in for the TCP+TLS handshake a new connection costs against
+graph.facebook.com (the mock speaks plain HTTP on loopback).
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from . import http_session
+from .graph_mock_server import MockGraphServer
+
+
+def _measure(server, post, requests_count, concurrency):
+    url = f"{server.url}/v17.0/1234/events"
+    payload = {"data": [{
+        "event_name": "Purchase",
+        "event_time": int(time.time()),
+        "action_source": "website",
+        "user_data": {"em": "0" * 64},
+    }]}
+    connections = server.stats["connections"]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(
+            lambda _i: post(url, json=payload, params={"access_token": "bench"}, timeout=5),
+            range(requests_count),
+        ))
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": round(elapsed, 3),
+        "req_per_s": round(requests_count / elapsed, 1),
+        "connections": server.stats["connections"] - connections,
+    }
+
+
+def run(requests_count=500, concurrency=8, connect_delay=0.02):
+    http_session.configure(pool_maxsize=concurrency)
+    results = {}
+    with MockGraphServer(connect_delay=connect_delay) as server:
+        results["requests.post"] = _measure(server, requests.post, requests_count, concurrency)
+        session = http_session.get_session("bench")
+        results["pooled session"] = _measure(server, session.post, requests_count, concurrency)
+    http_session.close_all()
+
+    print(f"{requests_count} requests, concurrency {concurrency}")
+    for name, res in results.items():
+        print(
+            f"  {name:<15} {res['seconds']:>7}s {res['req_per_s']:>9} req/s "
+            f"{res['connections']:>6} connections opened"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    run()
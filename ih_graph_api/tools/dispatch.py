@@ -0,0 +1,114 @@
+"""Bounded-concurrency execution of outbound Graph API requests.
+
+A cron sending its batch request after request is bound by the round trip to
+graph.facebook.com (about 10 requests/s at 100 ms). :func:`run` sends them in
+parallel on a process-wide thread pool, with at most ``per_destination``
+requests in flight per destination (pixel id, WhatsApp phone number id)::
+
+    from odoo.addons.ih_graph_api.tools import dispatch
+
+    results = dispatch.run([(pixel_id, partial(post, payload)) for payload in payloads])
+
+Jobs must not touch the caller's cursor or environment: read what they need
+before, and write their results back afterwards, from the calling thread.
+Each destination keeps being paced by its token bucket (``rate_limit.py``),
+so throughput grows with concurrency until Meta's rate limits bind.
+"""
+import logging
+import os
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+_logger = logging.getLogger(__name__)
+
+# Threads of the process-wide pool.
+DEFAULT_WORKERS = 16
+# Requests in flight per destination.
+DEFAULT_PER_DESTINATION = 4
+
+_lock = threading.Lock()
+_state = {
+    "executor": None,
+    "workers": DEFAULT_WORKERS,
+    "per_destination": DEFAULT_PER_DESTINATION,
+}
+
+
+def configure(workers=None, per_destination=None):
+    """Change the pool size and the per-destination limit; the pool is rebuilt on next use."""
+    with _lock:
+        if workers:
+            _state["workers"] = int(workers)
+        if per_destination:
+            _state["per_destination"] = int(per_destination)
+        executor, _state["executor"] = _state["executor"], None
+    if executor:
+        executor.shutdown(wait=False)
+
+
+def _executor():
+    with _lock:
+        if _state["executor"] is None:
+            _state["executor"] = ThreadPoolExecutor(
+                max_workers=_state["workers"], thread_name_prefix="graph_dispatch"
+            )
+        return _state["executor"]
+
+
+def run(jobs, per_destination=None):
+    """Call the jobs in parallel and return their results, in ``jobs`` order.
+
+    :param jobs: iterable of ``(destination, callable)``; callables take no
+                 argument. At most ``per_destination`` (default: the configured
+                 limit) callables of the same destination run at the same time.
+    :return: list of ``(result, exception)``: ``exception`` is None unless the
+             callable raised, in which case ``result`` is None.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    limit = per_destination or _state["per_destination"]
+    queues = defaultdict(deque)
+    for index, (destination, func) in enumerate(jobs):
+        queues[destination].append((index, func))
+    if len(jobs) == 1:
+        return [_call(jobs[0][1])]
+
+    executor = _executor()
+    results = [None] * len(jobs)
+    in_flight = {}  # future: (index, destination)
+
+    def submit(destination):
+        index, func = queues[destination].popleft()
+        in_flight[executor.submit(_call, func)] = (index, destination)
+
+    for destination, queue in queues.items():
+        for _i in range(min(limit, len(queue))):
+            submit(destination)
+    while in_flight:
+        done, _pending = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            index, destination = in_flight.pop(future)
+            results[index] = future.result()
+            if queues[destination]:
+                submit(destination)
+    return results
+
+
+def _forget_executor():
+    # The parent's pool threads do not exist in a forked child.
+    global _lock
+    _lock = threading.Lock()
+    _state["executor"] = None
+
+
+def _call(func):
+    try:
+        return func(), None
+    except Exception as e:
+        _logger.debug("Dispatched Graph API job failed", exc_info=True)
+        return None, e
+
+
+os.register_at_fork(after_in_child=_forget_executor)
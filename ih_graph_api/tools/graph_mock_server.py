@@ -0,0 +1,257 @@
+"""Local stand-in for the Graph API endpoints used by the Meta and WhatsApp senders.
+
+Serves ``POST /[version/]{pixel_id}/events`` (Conversions API) and
+``POST /[version/]{phone_number_id}/messages`` (WhatsApp Cloud API) with
+configurable latency, server errors and 429 throttling, and validates payloads
+the way Meta does (rejected requests get a Graph-style error body).
+
+Standalone::
+
+    python3 graph_mock_server.py --port 8765 --latency 0.08 --error-rate 0.01 --throttle-rate 0.02
+
+then point Odoo at it with ``graph_api_endpoint = http://127.0.0.1:8765`` in
+the configuration file. It can also be embedded (see ``loadtest.py``)::
+
+    with MockGraphServer(latency=0.05) as server:
+        ...  # server.url, server.stats
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MAX_EVENTS_PER_REQUEST = 1000
+# Meta rejects events older than 7 days or more than a minute in the future.
+MAX_EVENT_AGE = 7 * 24 * 3600
+MAX_EVENT_SKEW = 60
+ACTION_SOURCES = {
+    "website", "app", "email", "phone_call", "chat", "physical_store",
+    "system_generated", "business_messaging", "other",
+}
+WHATSAPP_MESSAGE_TYPES = {
+    "text", "template", "image", "document", "audio", "video", "sticker",
+    "location", "contacts", "interactive", "reaction",
+}
+
+_ROUTE = re.compile(r"^/(?:v\d+\.\d+/)?(?P<node>[^/]+)/(?P<edge>events|messages)/?$")
+
+
+class GraphError(Exception):
+    def __init__(self, status, message, code=100, subcode=None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.subcode = subcode
+
+    def body(self):
+        error = {
+            "message": str(self),
+            "type": "OAuthException",
+            "code": self.code,
+            "fbtrace_id": uuid.uuid4().hex[:12],
+        }
+        if self.subcode:
+            error["error_subcode"] = self.subcode
+        return {"error": error}
+
+
+def validate_events(body, now=None):
+    """Validate a Conversions API ``/events`` body; return the number of events."""
+    now = now or time.time()
+    data = body.get("data")
+    if not isinstance(data, list) or not data:
+        raise GraphError(400, "(#100) The parameter data is required")
+    if len(data) > MAX_EVENTS_PER_REQUEST:
+        raise GraphError(400, f"(#100) A maximum of {MAX_EVENTS_PER_REQUEST} events can be sent per request")
+    for index, event in enumerate(data):
+        if not isinstance(event, dict) or not event.get("event_name"):
+            raise GraphError(400, f"(#100) data[{index}]: event_name is required", subcode=2804003)
+        event_time = event.get("event_time")
+        if not isinstance(event_time, int):
+            raise GraphError(400, f"(#100) data[{index}]: event_time must be a Unix timestamp", subcode=2804003)
+        if event_time < now - MAX_EVENT_AGE or event_time > now + MAX_EVENT_SKEW:
+            raise GraphError(400, f"(#100) data[{index}]: event_time is out of the accepted range", subcode=2804004)
+        if event.get("action_source") not in ACTION_SOURCES:
+            raise GraphError(400, f"(#100) data[{index}]: invalid action_source", subcode=2804003)
+        if not isinstance(event.get("user_data"), dict) or not event["user_data"]:
+            raise GraphError(400, f"(#100) data[{index}]: user_data is required", subcode=2804050)
+    return len(data)
+
+
+def validate_message(body):
+    """Validate a WhatsApp Cloud API ``/messages`` body."""
+    if body.get("messaging_product") != "whatsapp":
+        raise GraphError(400, "(#100) Param messaging_product must be 'whatsapp'")
+    if not body.get("to"):
+        raise GraphError(400, "(#100) The parameter to is required")
+    message_type = body.get("type", "text")
+    if message_type not in WHATSAPP_MESSAGE_TYPES:
+        raise GraphError(400, f"(#100) Param type is not valid: {message_type}")
+    if message_type not in body:
+        raise GraphError(400, f"(#100) The parameter {message_type} is required")
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.record("connections")
+        if self.server.connect_delay:
+            time.sleep(self.server.connect_delay)
+
+    def do_POST(self):
+        server = self.server
+        route = _ROUTE.match(self.path.split("?", 1)[0])
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        if not route:
+            return self._reply(404, {"error": {"message": "Unknown path", "code": 803}})
+
+        edge = route["edge"]
+        server.record(f"{edge}_requests")
+        if server.latency:
+            time.sleep(max(0.0, random.gauss(server.latency, server.latency * server.jitter)))
+
+        roll = random.random()
+        if roll < server.throttle_rate:
+            server.record(f"{edge}_throttled")
+            return self._reply(
+                429,
+                GraphError(429, "(#80004) There have been too many calls", code=80004).body(),
+                usage=100,
+            )
+        if roll < server.throttle_rate + server.error_rate:
+            server.record(f"{edge}_errors")
+            return self._reply(503, GraphError(503, "Service temporarily unavailable", code=2).body())
+
+        try:
+            body = json.loads(raw or b"{}")
+            if edge == "events":
+                if "access_token" not in self.path:
+                    raise GraphError(400, "An access token is required", code=104)
+                received = validate_events(body)
+                server.record("events_received", received)
+                reply = {"events_received": received, "messages": [], "fbtrace_id": uuid.uuid4().hex[:12]}
+            else:
+                if not (self.headers.get("Authorization") or "").startswith("Bearer "):
+                    raise GraphError(401, "An access token is required", code=190)
+                validate_message(body)
+                server.record("messages_received")
+                reply = {
+                    "messaging_product": "whatsapp",
+                    "contacts": [{"input": body["to"], "wa_id": body["to"]}],
+                    "messages": [{"id": f"wamid.{uuid.uuid4().hex}"}],
+                }
+        except (ValueError, GraphError) as e:
+            error = e if isinstance(e, GraphError) else GraphError(400, f"Invalid JSON: {e}")
+            server.record(f"{edge}_rejected")
+            return self._reply(error.status, error.body())
+        self._reply(200, reply)
+
+    def _reply(self, status, body, usage=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        usage = self.server.usage() if usage is None else usage
+        self.send_header("X-App-Usage", json.dumps({"call_count": usage, "total_cputime": usage, "total_time": usage}))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockGraphServer(ThreadingHTTPServer):
+    """Threaded mock Graph API server; use as a context manager to run it in background.
+
+    :param latency: mean response time, in seconds.
+    :param jitter: standard deviation of the latency, as a fraction of it.
+    :param error_rate: share of requests answered with a 503.
+    :param throttle_rate: share of requests answered with a 429.
+    :param connect_delay: pause on each new connection (stands in for TLS setup).
+    :param calls_per_window: calls after which reported usage reaches 100%,
+                             over ``usage_window`` seconds.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, address=("127.0.0.1", 0), latency=0.0, jitter=0.2, error_rate=0.0,
+        throttle_rate=0.0, connect_delay=0.0, calls_per_window=1000, usage_window=60,
+    ):
+        super().__init__(address, _MockHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.connect_delay = connect_delay
+        self.calls_per_window = calls_per_window
+        self.usage_window = usage_window
+        self.stats = Counter()
+        self._calls = []
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record(self, key, count=1):
+        with self._lock:
+            self.stats[key] += count
+            if key.endswith("_requests"):
+                self._calls.append(time.monotonic())
+
+    def usage(self):
+        """Percentage of the call budget used over the sliding window."""
+        horizon = time.monotonic() - self.usage_window
+        with self._lock:
+            self._calls = [t for t in self._calls if t >= horizon]
+            return min(100, int(100 * len(self._calls) / self.calls_per_window))
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="mean latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--connect-delay", type=float, default=0.0)
+    parser.add_argument("--calls-per-window", type=int, default=1000)
+    args = parser.parse_args()
+
+    server = MockGraphServer(
+        (args.host, args.port), latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+        connect_delay=args.connect_delay, calls_per_window=args.calls_per_window,
+    )
+    print(f"Mock Graph API listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(dict(server.stats))
+
+
+if __name__ == "__main__":
+    main()
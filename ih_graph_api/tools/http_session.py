@@ -0,0 +1,173 @@
+"""Process-wide registry of pooled, keep-alive HTTP sessions.
+
+Calling ``requests.post`` opens (and TLS-negotiates) a new connection for every
+request. Sessions returned by :func:`get_session` keep connections alive in a
+per-host pool that is shared by every thread of the process::
+
+    from odoo.addons.ih_graph_api.tools import http_session
+
+    response = http_session.get_session().post(url, json=payload)
+
+Sessions are created lazily, dropped in forked children (prefork workers must
+not share sockets with their parent) and closed when the process exits.
+
+When a ``graph_endpoint`` is configured (e.g. the local mock server of
+``graph_mock_server.py``), requests to graph.facebook.com are sent there instead.
+"""
+import atexit
+import logging
+import os
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION = "graph"
+# Number of distinct hosts whose pools are kept around.
+DEFAULT_POOL_CONNECTIONS = 10
+# Connections kept alive per host.
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_TIMEOUT = 10
+GRAPH_ORIGIN = "https://graph.facebook.com"
+
+_lock = threading.Lock()
+_sessions = {}
+_settings = {
+    "pool_connections": DEFAULT_POOL_CONNECTIONS,
+    "pool_maxsize": DEFAULT_POOL_MAXSIZE,
+    "host_limits": {},
+    "graph_endpoint": None,
+}
+
+
+class PooledSession(requests.Session):
+    """``requests.Session`` applying a default timeout to every request."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        super().__init__()
+        self.timeout = timeout
+        # Shared by unrelated callers: never carry cookies between them.
+        self.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, _redirect(url), **kwargs)
+
+
+def configure(pool_connections=None, pool_maxsize=None, host_limits=None, graph_endpoint=None):
+    """Change pool sizes; existing sessions are closed and rebuilt on next use.
+
+    :param pool_connections: number of per-host pools kept by a session.
+    :param pool_maxsize: connections kept alive per host.
+    :param host_limits: ``{host: max_connections}``; requests to these hosts
+                        block rather than exceed the limit.
+    :param graph_endpoint: origin replacing ``https://graph.facebook.com``
+                           (load tests against a mock server); ``False`` resets it.
+    """
+    with _lock:
+        if graph_endpoint is not None:
+            _settings["graph_endpoint"] = graph_endpoint and graph_endpoint.rstrip("/")
+            if graph_endpoint:
+                _logger.warning("Graph API requests are redirected to %s", graph_endpoint)
+        if pool_connections:
+            _settings["pool_connections"] = pool_connections
+        if pool_maxsize:
+            _settings["pool_maxsize"] = pool_maxsize
+        if host_limits is not None:
+            _settings["host_limits"] = dict(host_limits)
+        _close_sessions()
+
+
+def graph_endpoint():
+    """Origin Graph API requests are redirected to, if any."""
+    return _settings["graph_endpoint"]
+
+
+def get_session(name=DEFAULT_SESSION):
+    """Return the shared session registered under ``name``, creating it if needed."""
+    session = _sessions.get(name)
+    if session is None:
+        with _lock:
+            session = _sessions.get(name)
+            if session is None:
+                session = _sessions[name] = _new_session()
+    return session
+
+
+def close_all():
+    """Close every registered session and its pooled connections."""
+    with _lock:
+        _close_sessions()
+
+
+class RequestsProxy:
+    """Stand-in for the ``requests`` module routing calls through a pooled session.
+
+    Lets code doing ``requests.request(...)``/``requests.post(...)`` reuse
+    connections by swapping its module-level ``requests`` reference; every
+    other attribute (``exceptions``, ``RequestException``, ...) is the real one.
+    """
+
+    def __init__(self, name=DEFAULT_SESSION):
+        self._name = name
+
+    def request(self, method, url, **kwargs):
+        return get_session(self._name).request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+def _redirect(url):
+    endpoint = _settings["graph_endpoint"]
+    if endpoint and url.startswith(GRAPH_ORIGIN):
+        return endpoint + url[len(GRAPH_ORIGIN):]
+    return url
+
+
+def _new_session():
+    session = PooledSession()
+    adapter = HTTPAdapter(
+        pool_connections=_settings["pool_connections"],
+        pool_maxsize=_settings["pool_maxsize"],
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    for host, limit in _settings["host_limits"].items():
+        host_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=limit, pool_block=True)
+        for scheme in ("https", "http"):
+            session.mount(f"{scheme}://{host}/", host_adapter)
+    return session
+
+
+def _close_sessions():
+    while _sessions:
+        _name, session = _sessions.popitem()
+        try:
+            session.close()
+        except Exception:  # pragma: no cover - best effort on teardown
+            _logger.debug("Error while closing HTTP session", exc_info=True)
+
+
+def _forget_sessions():
+    # The child shares the parent's sockets: drop them without closing,
+    # a TLS shutdown here would break the parent's connections.
+    global _lock
+    _lock = threading.Lock()
+    _sessions.clear()
+
+
+os.register_at_fork(after_in_child=_forget_sessions)
+atexit.register(close_all)
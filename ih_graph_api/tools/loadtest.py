@@ -0,0 +1,155 @@
+"""Load-test harness for the Meta Conversions API and WhatsApp senders.
+
+Start the mock server (``graph_mock_server.py``), set ``graph_api_endpoint``
+to its URL in the Odoo configuration file, then from ``odoo-bin shell -d <db>``::
+
+    from odoo.addons.ih_graph_api.tools import loadtest
+    loadtest.run(env, "capi_send_event", concurrency=8, operations=2000)
+    loadtest.run_all(env, concurrency_levels=(1, 4, 16))
+
+Every worker thread uses its own cursor and rolls back when done, so the
+database is left untouched. Scenarios making HTTP calls refuse to run unless
+Graph API calls are redirected, so a load test never reaches graph.facebook.com.
+
+Reported per scenario and concurrency level: throughput, p50/p95/p99 latency
+and SQL queries per operation.
+"""
+import math
+import threading
+import time
+
+from odoo import SUPERUSER_ID, api
+from odoo.exceptions import UserError
+
+from . import http_session
+
+
+def _website_orders(env):
+    orders = env["sale.order"].search(
+        [("website_id", "!=", False), ("partner_id.email", "!=", False)], limit=200
+    )
+    if not orders:
+        raise UserError("The load test needs website orders with a customer email.")
+    return orders
+
+
+def _capi_event(env, _ctx, i):
+    return env["meta.conversions.api"].send_event(
+        event_name="Purchase",
+        event_id=f"loadtest_{threading.get_ident()}_{i}",
+        user_data={"em": "0" * 64, "client_user_agent": "loadtest"},
+        custom_data={"currency": "USD", "value": 10.0},
+    )
+
+
+def _capi_event_delivered(env, ctx, i):
+    event = _capi_event(env, ctx, i)
+    if event:
+        event._send()
+
+
+def _capi_purchase(env, ctx, i):
+    # Orders are reused: without a distinct event_id, every pass after the
+    # first would be dropped by meta.capi.dedup (and concurrent workers wait
+    # on each other's dedup key), measuring lock waits instead of enqueueing.
+    batch = ctx[i % len(ctx)]._meta_capi_purchase_batch()
+    for values in batch:
+        values["event_id"] = f"{values['event_id']}_loadtest{i}"
+    env["meta.conversions.api"].send_events(batch)
+
+
+def _whatsapp_confirmation(env, ctx, i):
+    ctx[i % len(ctx)]._send_order_confirmation_whatsapp()
+
+
+# name: (model that must be installed, makes HTTP calls, setup, operation)
+SCENARIOS = {
+    "capi_send_event": ("meta.conversions.api", False, lambda env: None, _capi_event),
+    "capi_send_event_delivered": ("meta.conversions.api", True, lambda env: None, _capi_event_delivered),
+    "capi_purchase_event": ("meta.conversions.api", False, _website_orders, _capi_purchase),
+    "whatsapp_confirmation": ("whatsapp.composer", True, _website_orders, _whatsapp_confirmation),
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _worker(registry, operation, setup, start, stop, latencies, queries, errors):
+    with registry.cursor() as cr:
+        env = api.Environment(cr, SUPERUSER_ID, {})
+        ctx = setup(env)
+        for i in range(start, stop):
+            queries_before = cr.sql_log_count
+            started = time.perf_counter()
+            try:
+                with cr.savepoint():
+                    operation(env, ctx, i)
+                    env.flush_all()
+            except Exception:  # keep measuring, report the count
+                errors.append(i)
+            latencies.append(time.perf_counter() - started)
+            queries.append(cr.sql_log_count - queries_before)
+        cr.rollback()
+
+
+def run(env, scenario, concurrency=4, operations=1000):
+    model, needs_http, setup, operation = SCENARIOS[scenario]
+    if model not in env:
+        raise UserError(f"Scenario {scenario} needs the model {model}.")
+    if needs_http and not http_session.graph_endpoint():
+        raise UserError(
+            f"Scenario {scenario} sends HTTP requests: set graph_api_endpoint to a mock server first."
+        )
+
+    latencies, queries, errors = [], [], []
+    per_worker = -(-operations // concurrency)
+    threads = [
+        threading.Thread(
+            target=_worker,
+            args=(env.registry, operation, setup, start, min(start + per_worker, operations),
+                  latencies, queries, errors),
+        )
+        for start in range(0, operations, per_worker)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    result = {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "operations": len(latencies),
+        "errors": len(errors),
+        "ops_per_s": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "queries_per_op": round(sum(queries) / max(len(queries), 1), 2),
+    }
+    print(
+        "{scenario:<26} c={concurrency:<3} {operations:>6} ops {errors:>4} err "
+        "{ops_per_s:>9} ops/s  p50 {p50_ms:>8} ms  p95 {p95_ms:>8} ms  p99 {p99_ms:>8} ms  "
+        "{queries_per_op:>6} q/op".format(**result)
+    )
+    return result
+
+
+def run_all(env, concurrency_levels=(1, 4, 16), operations=1000):
+    """Run every scenario available in this database at each concurrency level."""
+    results = []
+    for scenario, (model, needs_http, _setup, _operation) in SCENARIOS.items():
+        if model not in env or (needs_http and not http_session.graph_endpoint()):
+            print(f"{scenario:<26} skipped")
+            continue
+        for concurrency in concurrency_levels:
+            results.append(run(env, scenario, concurrency, operations))
+    return results
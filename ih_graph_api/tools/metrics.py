@@ -0,0 +1,177 @@
+"""Counters and timers for the hot paths of the Meta and WhatsApp integrations.
+
+Wrap a stage with :func:`measure`; calls, errors, time spent and SQL queries
+are recorded per stage::
+
+    from odoo.addons.ih_graph_api.tools import metrics
+
+    with metrics.measure("whatsapp.send", self.env):
+        composer._send_whatsapp_template()
+
+Counters are kept in memory and each process adds them to the
+``graph.api.metric`` table every ``flush_interval`` seconds, from a background
+thread: the table holds the totals of all workers, served in Prometheus text
+format by ``/graph_api/metrics`` (see :func:`render_prometheus`).
+
+:func:`trace` replaces per-call INFO logs: it logs at DEBUG level, and only a
+sample of the calls.
+"""
+import atexit
+import logging
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 30.0
+DEFAULT_TRACE_SAMPLE_RATE = 0.01
+
+_lock = threading.Lock()
+# {(dbname, stage): [calls, errors, seconds, queries]} not flushed yet
+_pending = defaultdict(lambda: [0, 0, 0.0, 0])
+_state = {
+    "started": False,
+    "flush_interval": DEFAULT_FLUSH_INTERVAL,
+    "trace_sample_rate": DEFAULT_TRACE_SAMPLE_RATE,
+}
+
+
+def configure(flush_interval=None, trace_sample_rate=None):
+    if flush_interval:
+        _state["flush_interval"] = float(flush_interval)
+    if trace_sample_rate is not None:
+        _state["trace_sample_rate"] = float(trace_sample_rate)
+
+
+def record(dbname, stage, calls=1, errors=0, seconds=0.0, queries=0):
+    with _lock:
+        if not _state["started"]:
+            _start()
+        counters = _pending[(dbname, stage)]
+        counters[0] += calls
+        counters[1] += errors
+        counters[2] += seconds
+        counters[3] += queries
+
+
+@contextmanager
+def measure(stage, env):
+    """Count and time the enclosed block as one call of ``stage``.
+
+    An exception escaping the block is counted as an error (and re-raised).
+    """
+    cr = env.cr
+    queries_before = getattr(cr, "sql_log_count", 0)
+    started = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        record(
+            cr.dbname, stage,
+            errors=int(failed),
+            seconds=time.perf_counter() - started,
+            queries=getattr(cr, "sql_log_count", 0) - queries_before,
+        )
+
+
+@contextmanager
+def timer(dbname, stage):
+    """Like :func:`measure`, for threads working without a cursor (no query count)."""
+    started = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        record(dbname, stage, errors=int(failed), seconds=time.perf_counter() - started)
+
+
+def trace(logger, msg, *args):
+    """Log ``msg`` at DEBUG level for a sample of the calls."""
+    if logger.isEnabledFor(logging.DEBUG) and random.random() < _state["trace_sample_rate"]:
+        logger.debug(msg, *args)
+
+
+def _start():
+    _state["started"] = True
+    threading.Thread(target=_run, name="graph_api_metrics", daemon=True).start()
+
+
+def _forget_counters():
+    # The parent's counters are its own to flush, and its flushing thread
+    # does not exist in a forked child.
+    global _lock
+    _lock = threading.Lock()
+    _pending.clear()
+    _state["started"] = False
+
+
+def _run():
+    while True:
+        time.sleep(_state["flush_interval"])
+        flush()
+
+
+def _drain():
+    with _lock:
+        drained = dict(_pending)
+        _pending.clear()
+    by_db = defaultdict(dict)
+    for (dbname, stage), counters in drained.items():
+        by_db[dbname][stage] = counters
+    return by_db
+
+
+def flush():
+    """Add the counters of this process to the ``graph.api.metric`` totals."""
+    drained = _drain()
+    if not drained:
+        return
+    from odoo import SUPERUSER_ID, api
+    from odoo.modules.registry import Registry
+
+    for dbname, counters in drained.items():
+        try:
+            registry = Registry(dbname)
+            if "graph.api.metric" not in registry:
+                continue
+            with registry.cursor() as cr:
+                api.Environment(cr, SUPERUSER_ID, {})["graph.api.metric"]._add_counters(counters)
+        except Exception:
+            _logger.warning("Could not flush Graph API metrics for %s", dbname, exc_info=True)
+
+
+def _format(value):
+    value = float(value or 0)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def render_prometheus(rows):
+    """Prometheus text exposition of ``[(stage, calls, errors, seconds, queries)]``."""
+    series = (
+        ("calls", "Calls per stage", 1),
+        ("errors", "Calls that raised an exception", 2),
+        ("duration_seconds", "Time spent per stage", 3),
+        ("queries", "SQL queries issued per stage", 4),
+    )
+    lines = []
+    for name, help_text, index in series:
+        lines.append(f"# HELP graph_api_{name}_total {help_text}.")
+        lines.append(f"# TYPE graph_api_{name}_total counter")
+        for row in rows:
+            lines.append(f'graph_api_{name}_total{{stage="{row[0]}"}} {_format(row[index])}')
+    return "\n".join(lines) + "\n"
+
+
+os.register_at_fork(after_in_child=_forget_counters)
+atexit.register(flush)
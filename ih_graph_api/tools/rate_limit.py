@@ -0,0 +1,233 @@
+"""Rate-limit awareness and retry scheduling for Graph API calls.
+
+- :func:`parse_usage` reads Meta's throttling headers (``X-App-Usage``,
+  ``X-Business-Use-Case-Usage``).
+- :class:`TokenBucket` paces calls per destination (pixel, WhatsApp phone
+  number id); :func:`bucket` returns the process-wide bucket of a key. Buckets
+  slow down as the reported usage approaches 100% and pause when Meta says so.
+- :func:`backoff_delay` computes exponential backoff with jitter, for callers
+  that reschedule (queues) as well as those retrying in place
+  (:class:`ThrottledRequests`).
+
+Limits are enforced per process: with several workers sending to the same
+destination, configure rates accordingly.
+"""
+import json
+import logging
+import random
+import threading
+import time
+
+import requests
+
+from .http_session import DEFAULT_SESSION, RequestsProxy
+
+_logger = logging.getLogger(__name__)
+
+# Graph error codes meaning "slow down" (application, account, pixel and
+# WhatsApp throughput/pair limits), whatever the HTTP status.
+RATE_LIMIT_ERROR_CODES = {4, 17, 32, 613, 80004, 80007, 130429, 131048, 131056}
+# Default calls per second allowed per destination key, by kind.
+DEFAULT_RATES = {
+    "capi": 50.0,
+    "whatsapp": 80.0,
+}
+# Usage (in %) from which buckets start slowing down.
+SLOWDOWN_USAGE = 75
+
+_lock = threading.Lock()
+_buckets = {}
+_rates = dict(DEFAULT_RATES)
+
+
+def parse_usage(headers):
+    """Extract the call budget usage from Meta's throttling headers.
+
+    :return: ``(usage, regain_seconds)``: the highest usage percentage
+             reported, and how long Meta says access is blocked (0 if not).
+    """
+    usage, regain = 0, 0
+    try:
+        app_usage = json.loads(headers.get("X-App-Usage") or "{}")
+        usage = max([usage] + [app_usage.get(k) or 0 for k in ("call_count", "total_cputime", "total_time")])
+        business_usage = json.loads(headers.get("X-Business-Use-Case-Usage") or "{}")
+        for entries in business_usage.values():
+            for entry in entries:
+                usage = max([usage] + [entry.get(k) or 0 for k in ("call_count", "total_cputime", "total_time")])
+                regain = max(regain, (entry.get("estimated_time_to_regain_access") or 0) * 60)
+    except (ValueError, AttributeError, TypeError):
+        _logger.debug("Unparsable Graph API usage headers: %s", headers, exc_info=True)
+    return usage, regain
+
+
+def error_code(response):
+    """Graph error code of ``response``, if its body carries one."""
+    try:
+        return response.json()["error"]["code"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def is_throttled(status, code=None):
+    return status == 429 or code in RATE_LIMIT_ERROR_CODES
+
+
+def is_retryable(status, code=None):
+    """Whether a failed call may succeed later: network errors, 5xx and throttling."""
+    return status is None or status >= 500 or is_throttled(status, code)
+
+
+def backoff_delay(attempt, base=1.0, cap=3600.0, retry_after=0):
+    """Exponential backoff with jitter for the ``attempt``-th retry (0-based).
+
+    Half of the exponential delay is fixed and half random, so concurrent
+    retries spread out without collapsing to zero; never below ``retry_after``.
+    """
+    delay = min(cap, base * 2 ** attempt)
+    return max(retry_after, delay / 2 + random.uniform(0, delay / 2))
+
+
+class TokenBucket:
+    """Thread-safe token bucket pacing calls to one destination."""
+
+    def __init__(self, rate, capacity=None):
+        self.base_rate = self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self.tokens = self.capacity
+        self.paused_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _wait_time(self, now, tokens):
+        wait = max(0.0, self.paused_until - now)
+        missing = tokens - self.tokens
+        if missing > 0:
+            wait = max(wait, missing / self.rate)
+        return wait
+
+    def wait_time(self, tokens=1):
+        """Seconds before ``tokens`` calls would be allowed."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return self._wait_time(now, tokens)
+
+    def acquire(self, tokens=1, max_wait=None):
+        """Reserve ``tokens`` calls, sleeping until they are allowed.
+
+        :param max_wait: give up (and reserve nothing) if the wait would be longer.
+        :return: True once the calls may be made, False if given up.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = self._wait_time(now, tokens)
+            if max_wait is not None and wait > max_wait:
+                return False
+            self.tokens -= tokens
+        if wait:
+            time.sleep(wait)
+        return True
+
+    def observe(self, usage, pause=0):
+        """Adapt the pace to the usage Meta reports; pause for ``pause`` seconds."""
+        with self._lock:
+            if usage > SLOWDOWN_USAGE:
+                factor = max(0.1, (100 - usage) / (100 - SLOWDOWN_USAGE))
+                self.rate = self.base_rate * factor
+            else:
+                self.rate = self.base_rate
+            if pause:
+                self.paused_until = max(self.paused_until, time.monotonic() + pause)
+
+
+def configure_rates(**rates):
+    """Set the calls per second allowed per destination, e.g. ``configure_rates(capi=20)``."""
+    with _lock:
+        _rates.update({kind: float(rate) for kind, rate in rates.items() if rate})
+        _buckets.clear()
+
+
+def bucket(kind, key):
+    """Process-wide token bucket for destination ``key`` of ``kind`` ('capi', 'whatsapp')."""
+    bucket_key = (kind, key)
+    result = _buckets.get(bucket_key)
+    if result is None:
+        with _lock:
+            result = _buckets.setdefault(bucket_key, TokenBucket(_rates[kind]))
+    return result
+
+
+def observe(destination, response):
+    """Feed ``response`` to the bucket ``destination``.
+
+    :return: ``(throttled, retry_after)``: whether Meta throttled the call and
+             how many seconds it asks to wait.
+    """
+    usage, regain = parse_usage(response.headers)
+    throttled = is_throttled(response.status_code, error_code(response) if not response.ok else None)
+    retry_after = regain
+    if throttled:
+        try:
+            retry_after = max(retry_after, float(response.headers.get("Retry-After") or 0))
+        except ValueError:
+            pass
+        retry_after = retry_after or 1
+    destination.observe(usage, pause=retry_after if throttled else regain)
+    return throttled, retry_after
+
+
+class DestinationThrottled(requests.exceptions.RequestException):
+    """No call made: the destination's rate limit would have made us wait too long."""
+
+    def __init__(self, message, retry_after=0.0, **kwargs):
+        super().__init__(message, **kwargs)
+        self.retry_after = retry_after
+
+
+class ThrottledRequests(RequestsProxy):
+    """:class:`RequestsProxy` pacing calls per destination and retrying throttled ones.
+
+    :param kind: bucket kind of the destinations.
+    :param destination_of: ``url -> key``; calls whose key is None pass through.
+    :param max_attempts: calls made before a throttled response is returned as is.
+    :param max_delay: longest pause between two attempts, and longest wait for
+                      the destination's bucket, in seconds: when the bucket is
+                      paused for longer, :class:`DestinationThrottled` is raised
+                      without calling Meta.
+
+    Only throttled calls (rejected by Meta, hence not processed) are retried:
+    retrying 5xx responses could deliver a message twice.
+    """
+
+    def __init__(self, kind, destination_of, max_attempts=3, max_delay=10.0, name=DEFAULT_SESSION):
+        super().__init__(name)
+        self._kind = kind
+        self._destination_of = destination_of
+        self._max_attempts = max_attempts
+        self._max_delay = max_delay
+
+    def request(self, method, url, **kwargs):
+        key = self._destination_of(url)
+        if key is None:
+            return super().request(method, url, **kwargs)
+        destination = bucket(self._kind, key)
+        for attempt in range(self._max_attempts):
+            if not destination.acquire(max_wait=self._max_delay):
+                retry_after = destination.wait_time()
+                raise DestinationThrottled(
+                    f"Rate limit reached for {self._kind} {key}; retry in {retry_after:.0f}s",
+                    retry_after=retry_after,
+                )
+            response = super().request(method, url, **kwargs)
+            throttled, retry_after = observe(destination, response)
+            if not throttled or attempt == self._max_attempts - 1:
+                return response
+            delay = min(self._max_delay, backoff_delay(attempt, retry_after=retry_after))
+            _logger.info("Graph API throttled %s %s; retrying in %.1fs", self._kind, key, delay)
+            time.sleep(delay)
+        return response
@@ -8,6 +8,7 @@ Features
 ========
 - Client-side Meta Pixel tracking (PageView, AddToCart, Purchase)
 - Server-side Conversions API for reliable event tracking
+- Durable outbox: events are queued and delivered by a background cron
 - Event deduplication support between Pixel and CAPI
 - Unified configuration in Website settings
 - Automatic e-commerce event tracking
@@ -22,11 +23,19 @@ Benefits
     "website": "https://www.yourcompany.com",
     "category": "Website",
     "version": "17.0.2.0.0",
-    "depends": ["base", "website", "website_sale"],
+    "depends": ["base", "website", "website_sale", "ih_graph_api"],
     "data": [
+        "security/ir.model.access.csv",
+        "data/ir_cron_data.xml",
         "views/res_config_settings_views.xml",
+        "views/meta_capi_event_views.xml",
         "views/meta_pixel_templates.xml",
     ],
+    "assets": {
+        "web.assets_frontend": [
+            "ih_meta_conversions_api/static/src/js/meta_pixel.js",
+        ],
+    },
     "demo": [],
     "installable": True,
     "application": False,
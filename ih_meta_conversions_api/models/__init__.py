@@ -1,4 +1,10 @@
 from . import res_config_settings
+from . import res_partner
+from . import website
 from . import meta_conversions_api
+from . import meta_capi_event
+from . import meta_capi_dedup
+from . import meta_capi_backfill
 from . import sale_order
+from . import ir_qweb
 
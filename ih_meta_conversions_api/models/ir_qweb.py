@@ -0,0 +1,12 @@
+from odoo import models
+
+
+class IrQWeb(models.AbstractModel):
+    _inherit = "ir.qweb"
+
+    def _prepare_frontend_environment(self, values):
+        """Expose the cached Meta settings of the current website to templates as ``meta_config``."""
+        irQweb = super()._prepare_frontend_environment(values)
+        website = self.env["website"].get_current_website()
+        values["meta_config"] = self.env["meta.conversions.api"].sudo()._get_config(website.id)
+        return irQweb
@@ -0,0 +1,102 @@
+import logging
+import threading
+from datetime import timedelta
+
+from odoo import _, fields, models
+from odoo.exceptions import UserError
+
+_logger = logging.getLogger(__name__)
+
+# Orders read per chunk (and transaction).
+BACKFILL_CHUNK_SIZE = 1000
+# Meta rejects website events whose event_time is more than 7 days old.
+MAX_EVENT_AGE_DAYS = 7
+
+
+class MetaCapiBackfill(models.Model):
+    """Resumable replay of the Purchase events of confirmed website orders.
+
+    From ``odoo-bin shell``::
+
+        backfill = env["meta.capi.backfill"].create({"date_from": "2024-05-01"})
+        backfill.run()
+        # after a crash, resume where it stopped:
+        env["meta.capi.backfill"].search([("state", "=", "running")]).run()
+
+    Orders are read by keyset pagination on ``id`` and their events queued in
+    the ``meta.capi.event`` outbox, one transaction per chunk; the checkpoint
+    (``last_order_id``) is committed with the events it covers, and the
+    environment cache is dropped after each chunk so memory stays flat.
+    """
+
+    _name = "meta.capi.backfill"
+    _description = "Meta Conversions API Purchase Backfill"
+    _order = "id desc"
+
+    pixel_id = fields.Char(
+        string="Pixel ID",
+        required=True,
+        default=lambda self: self.env["meta.conversions.api"]._get_config().pixel_id,
+        help="Orders of the websites routed to this pixel are replayed.",
+    )
+    date_from = fields.Datetime(
+        help="Replay orders confirmed since this date. Meta only accepts events of the "
+             "last 7 days: older orders are skipped.",
+    )
+    last_order_id = fields.Integer(readonly=True, help="Checkpoint: last order processed.")
+    event_count = fields.Integer(readonly=True)
+    state = fields.Selection(
+        [("running", "Running"), ("done", "Done")],
+        default="running",
+        required=True,
+        readonly=True,
+    )
+
+    def _order_domain(self):
+        self.ensure_one()
+        oldest = fields.Datetime.now() - timedelta(days=MAX_EVENT_AGE_DAYS)
+        if self.date_from and self.date_from < oldest:
+            _logger.warning(
+                "Meta CAPI backfill: orders before %s are too old for Meta and skipped.", oldest
+            )
+        date_from = max(self.date_from, oldest) if self.date_from else oldest
+        return [
+            ("state", "=", "sale"),
+            ("website_id", "in", self._website_ids()),
+            ("date_order", ">=", date_from),
+        ]
+
+    def _website_ids(self):
+        """Websites whose events are routed to the pixel of this backfill."""
+        self.ensure_one()
+        table = self.env["meta.conversions.api"]._get_routing_table()
+        return [website_id for website_id, config in table.items() if website_id and config.pixel_id == self.pixel_id]
+
+    def run(self, chunk_size=BACKFILL_CHUNK_SIZE):
+        """Queue the Purchase events of the remaining orders, chunk by chunk."""
+        self.ensure_one()
+        config = self.env["meta.conversions.api"]._get_config()
+        if not config.enabled:
+            raise UserError(_("Enable the Meta Conversions API before running a backfill."))
+        if not self._website_ids():
+            raise UserError(_("No website sends its events to pixel %s.", self.pixel_id))
+
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        SaleOrder = self.env["sale.order"]
+        domain = self._order_domain()
+        last_id, count = self.last_order_id, self.event_count
+        while True:
+            orders = SaleOrder.search([("id", ">", last_id)] + domain, order="id", limit=chunk_size)
+            if not orders:
+                break
+            orders.fetch(["website_id", "partner_id", "date_order", "meta_capi_commerce_data"])
+            orders.partner_id.sudo().fetch(["meta_capi_user_data"])
+            count += len(orders._meta_capi_send_purchase_event(use_order_date=True))
+            last_id = orders.ids[-1]
+            self.write({"last_order_id": last_id, "event_count": count})
+            if auto_commit:
+                self.env.cr.commit()
+            self.env.invalidate_all()
+            _logger.info("Meta CAPI backfill %s: %s event(s) queued, up to order %s", self.id, count, last_id)
+        self.state = "done"
+        return count
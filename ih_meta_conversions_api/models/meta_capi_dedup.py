@@ -0,0 +1,65 @@
+import hashlib
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+# Days a key is remembered; an event repeated after that is sent again.
+DEDUP_RETENTION_DAYS = 30
+
+
+def dedup_key(pixel_id, event_name, event_id):
+    """64-bit key (16 hex chars) identifying an event for a pixel."""
+    raw = f"{pixel_id}\x1f{event_name}\x1f{event_id}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+class MetaCapiDedup(models.Model):
+    """Index of the events already queued, by (pixel, event name, event id).
+
+    Only a truncated hash and a date are stored per event, so the table stays
+    small; keys older than ``DEDUP_RETENTION_DAYS`` are evicted by the
+    autovacuum. Repeated sends (e.g. an order confirmed twice) are dropped
+    before they are queued, hence before any call to Meta.
+    """
+
+    _name = "meta.capi.dedup"
+    _description = "Meta Conversions API Deduplication Key"
+    _log_access = False
+
+    key = fields.Char(required=True, size=16)
+    date = fields.Datetime(required=True, index=True, default=fields.Datetime.now)
+
+    _sql_constraints = [
+        ("key_uniq", "unique(key)", "This event has already been sent."),
+    ]
+
+    @api.model
+    def _claim(self, keys):
+        """Record ``keys``; return those that were not known yet.
+
+        Keys inserted by a concurrent transaction are only returned to the
+        first one to commit: the others wait on the unique index and skip them.
+        """
+        if not keys:
+            return set()
+        self.env.cr.execute(
+            """
+            INSERT INTO meta_capi_dedup (key, date)
+                 SELECT unnest(%s::varchar[]), now() at time zone 'UTC'
+            ON CONFLICT (key) DO NOTHING
+              RETURNING key
+            """,
+            [list(keys)],
+        )
+        return {row[0] for row in self.env.cr.fetchall()}
+
+    @api.model
+    def _release(self, keys):
+        """Forget ``keys``, so that the events they identify can be queued again."""
+        if keys:
+            self.env.cr.execute("DELETE FROM meta_capi_dedup WHERE key = ANY(%s)", [list(keys)])
+
+    @api.autovacuum
+    def _gc_expired_keys(self):
+        limit_date = fields.Datetime.now() - timedelta(days=DEDUP_RETENTION_DAYS)
+        self.env.cr.execute("DELETE FROM meta_capi_dedup WHERE date < %s", [limit_date])
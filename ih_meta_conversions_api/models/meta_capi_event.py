@@ -0,0 +1,254 @@
+import json
+import logging
+import threading
+from collections import defaultdict
+from datetime import timedelta
+from functools import partial
+
+from odoo import api, fields, models
+
+from odoo.addons.ih_graph_api.tools import dispatch, rate_limit
+
+from .meta_capi_dedup import dedup_key
+from .meta_conversions_api import post_events
+
+_logger = logging.getLogger(__name__)
+
+# Rows claimed per transaction by the queue drainer.
+BATCH_SIZE = 1000
+# Meta accepts at most 1,000 events per /events request.
+MAX_EVENTS_PER_REQUEST = 1000
+# Keep each request body well below Meta's payload size limit.
+MAX_REQUEST_BYTES = 1_000_000
+# Batches processed per cron run before handing over to a new run.
+MAX_BATCHES_PER_RUN = 50
+# Delivery attempts before an event is parked in the 'failed' state.
+MAX_ATTEMPTS = 8
+# Backoff between attempts: 1 min, 2 min, 4 min, ... capped at 6 hours.
+RETRY_BASE_DELAY = 60
+RETRY_MAX_DELAY = 6 * 3600
+# Days a delivered event is kept before being garbage collected.
+SENT_RETENTION_DAYS = 30
+
+
+class MetaCapiEvent(models.Model):
+    """Durable outbox of events waiting to be delivered to the Conversions API.
+
+    ``meta.conversions.api.send_event`` only writes a row here; the
+    ``ir_cron_meta_capi_send_events`` cron drains the queue in the background,
+    so the transaction that produced the event never waits on graph.facebook.com.
+    """
+
+    _name = "meta.capi.event"
+    _description = "Meta Conversions API Queued Event"
+    _order = "id desc"
+    _rec_name = "event_name"
+
+    event_name = fields.Char(required=True, readonly=True)
+    event_id = fields.Char(string="Event ID", index=True, readonly=True)
+    event_time = fields.Integer(required=True, readonly=True, help="Unix timestamp of the event.")
+    pixel_id = fields.Char(string="Pixel ID", required=True, readonly=True)
+    test_event_code = fields.Char(readonly=True)
+    res_model = fields.Char(string="Related Model", readonly=True)
+    res_id = fields.Many2oneReference(string="Related Record", model_field="res_model", readonly=True)
+    payload = fields.Json(
+        required=True,
+        readonly=True,
+        help="Event as posted in the 'data' list of the /events request.",
+    )
+    state = fields.Selection(
+        [
+            ("pending", "Pending"),
+            ("sent", "Sent"),
+            ("failed", "Failed"),
+        ],
+        default="pending",
+        required=True,
+        index=True,
+        readonly=True,
+    )
+    attempt_count = fields.Integer(default=0, readonly=True)
+    next_attempt_date = fields.Datetime(
+        readonly=True,
+        help="Retries are not attempted before this date (backoff, rate limits).",
+    )
+    last_error = fields.Text(readonly=True)
+    sent_date = fields.Datetime(readonly=True)
+
+    @api.model
+    def _enqueue(self, vals_list):
+        """Create pending events and wake up the queue cron."""
+        events = self.sudo().create(vals_list)
+        self.env.ref("ih_meta_conversions_api.ir_cron_meta_capi_send_events")._trigger()
+        return events
+
+    def action_retry(self):
+        self.filtered(lambda e: e.state == "failed").write(
+            {"state": "pending", "attempt_count": 0, "last_error": False, "next_attempt_date": False}
+        )
+        self.env.ref("ih_meta_conversions_api.ir_cron_meta_capi_send_events")._trigger()
+        return True
+
+    # ---------------------------------------------------------
+    # QUEUE PROCESSING
+    # ---------------------------------------------------------
+
+    def _claim_pending(self, after_id, limit):
+        """Lock the next pending rows, skipping those held by a concurrent run."""
+        self.env.cr.execute(
+            """
+            SELECT id
+              FROM meta_capi_event
+             WHERE state = 'pending' AND id > %s
+               AND (next_attempt_date IS NULL OR next_attempt_date <= now() at time zone 'UTC')
+          ORDER BY id
+             LIMIT %s
+               FOR UPDATE SKIP LOCKED
+            """,
+            [after_id, limit],
+        )
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
+
+    @api.model
+    def _cron_process_queue(self, batch_size=BATCH_SIZE):
+        auto_commit = not getattr(threading.current_thread(), "testing", False)
+        last_id = 0
+        for _batch in range(MAX_BATCHES_PER_RUN):
+            events = self._claim_pending(last_id, batch_size)
+            if not events:
+                return
+            last_id = max(events.ids)
+            events._send()
+            if auto_commit:
+                self.env.cr.commit()
+        # Budget exhausted with work left: let a fresh run pick it up.
+        self.env.ref("ih_meta_conversions_api.ir_cron_meta_capi_send_events")._trigger()
+
+    def _send(self):
+        """Deliver the events in ``self``, grouped per pixel and chunked.
+
+        Each destination pixel gets one request per chunk of up to
+        ``MAX_EVENTS_PER_REQUEST`` events, with its own access token. The
+        requests are made in parallel by ``dispatch`` threads, outside the
+        cursor; their outcomes are then written back in bulk.
+
+        Each event's state reflects its own outcome: when Meta rejects a chunk
+        because of one of its events, that event is failed and the rest of the
+        chunk posted again, so that one invalid event does not hold back the
+        others.
+        """
+        meta_api = self.env["meta.conversions.api"]
+        groups = {}
+        for event in self:
+            groups.setdefault((event.pixel_id, event.test_event_code), []).append(event.id)
+        chunks = []
+        for (pixel_id, test_event_code), ids in groups.items():
+            access_token = meta_api._get_access_token(pixel_id)
+            for chunk in self.browse(ids)._split_chunks():
+                chunks.append((chunk, pixel_id, access_token, test_event_code))
+        while chunks:
+            chunks = self._deliver_chunks(chunks)
+
+    def _split_chunks(self):
+        """Yield sub-recordsets respecting Meta's per-request count and size limits."""
+        chunk_ids, chunk_bytes = [], 0
+        for event in self:
+            size = len(json.dumps(event.payload))
+            if chunk_ids and (
+                len(chunk_ids) >= MAX_EVENTS_PER_REQUEST
+                or chunk_bytes + size > MAX_REQUEST_BYTES
+            ):
+                yield self.browse(chunk_ids)
+                chunk_ids, chunk_bytes = [], 0
+            chunk_ids.append(event.id)
+            chunk_bytes += size
+        if chunk_ids:
+            yield self.browse(chunk_ids)
+
+    def _deliver_chunks(self, chunks):
+        """Post ``[(events, pixel_id, access_token, test_event_code)]`` concurrently.
+
+        :return: the chunks to post again, without their invalid event (see :meth:`_send`).
+        """
+        meta_api = self.env["meta.conversions.api"]
+        dbname = self.env.cr.dbname
+        results = dispatch.run(
+            (pixel_id, partial(post_events, dbname, pixel_id, access_token, chunk.mapped("payload"), test_event_code))
+            for chunk, pixel_id, access_token, test_event_code in chunks
+        )
+        sent = self.browse()
+        log_entries, retry = [], []
+        for (chunk, pixel_id, access_token, test_event_code), (result, error) in zip(chunks, results):
+            if error:
+                chunk._mark_failed(str(error))
+                continue
+            log_entries += meta_api._log_entries(pixel_id, chunk, result)
+            if result.ok:
+                sent |= chunk
+            elif result.deferred:
+                chunk._postpone(result.retry_after)
+            elif (
+                not result.retryable and result.status_code == 400
+                and len(chunk) > 1 and result.event_index is not None and result.event_index < len(chunk)
+            ):
+                # Meta rejects the whole request when one event is invalid, and
+                # names it (data[i]): fail that one and post the others again.
+                # Other 400s (bad token, unknown pixel) fail the chunk at once.
+                invalid = chunk[result.event_index]
+                invalid._mark_failed(result.error, retryable=False)
+                retry.append((chunk - invalid, pixel_id, access_token, test_event_code))
+            else:
+                chunk._mark_failed(result.error, retryable=result.retryable, retry_after=result.retry_after)
+        sent._mark_sent()
+        self.env["graph.api.event.log"].sudo()._log(log_entries)
+        return retry
+
+    def _mark_sent(self):
+        self.write({
+            "state": "sent",
+            "sent_date": fields.Datetime.now(),
+            "last_error": False,
+            "next_attempt_date": False,
+        })
+
+    def _postpone(self, delay):
+        """Push the events back without counting an attempt (rate limit reached)."""
+        self.write({
+            "next_attempt_date": fields.Datetime.now() + timedelta(seconds=max(delay, 1)),
+        })
+
+    def _mark_failed(self, error, retryable=True, retry_after=0):
+        """Count a failed attempt; retryable failures are rescheduled with backoff.
+
+        The dedup keys of the events given up on are released: the event was
+        never delivered, so sending it again must not be dropped as a repeat.
+        """
+        by_attempts = defaultdict(list)
+        for event in self:
+            by_attempts[event.attempt_count + 1].append(event.id)
+        now = fields.Datetime.now()
+        for attempts, ids in by_attempts.items():
+            given_up = not retryable or attempts >= MAX_ATTEMPTS
+            delay = rate_limit.backoff_delay(
+                attempts - 1, base=RETRY_BASE_DELAY, cap=RETRY_MAX_DELAY, retry_after=retry_after
+            )
+            self.browse(ids).write({
+                "attempt_count": attempts,
+                "last_error": error,
+                "state": "failed" if given_up else "pending",
+                "next_attempt_date": False if given_up else now + timedelta(seconds=delay),
+            })
+            if given_up:
+                _logger.error(
+                    "Meta CAPI: giving up on events %s after %s attempts: %s",
+                    ids, attempts, error,
+                )
+                self.env["meta.capi.dedup"]._release({
+                    dedup_key(event.pixel_id, event.event_name, event.event_id)
+                    for event in self.browse(ids) if event.event_id
+                })
+
+    @api.autovacuum
+    def _gc_sent_events(self):
+        limit_date = fields.Datetime.now() - timedelta(days=SENT_RETENTION_DAYS)
+        self.search([("state", "=", "sent"), ("sent_date", "<", limit_date)]).unlink()
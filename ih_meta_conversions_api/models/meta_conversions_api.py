@@ -1,14 +1,76 @@
 import logging
+import re
 import time
+from typing import NamedTuple
 
-import requests
-
-from odoo import api, models, _
+from odoo import api, models, tools, _
 from odoo.exceptions import UserError
+from odoo.tools import frozendict
+
+from odoo.addons.ih_graph_api.tools import http_session, metrics, rate_limit
+
+from .meta_capi_dedup import dedup_key
 
 _logger = logging.getLogger(__name__)
 
 
+# Longest wait for a pixel's rate limit before deferring a chunk to a later run.
+MAX_THROTTLE_WAIT = 5
+# Reference to the invalid event in Graph error messages, e.g. "data[12].user_data"
+_EVENT_REFERENCE = re.compile(r"\bdata\[(\d+)\]")
+
+
+def _is_true(value):
+    return value in (True, "True", "true", "1")
+
+
+def event_error_index(response):
+    """Index in the posted ``data`` of the event a Graph error is about, or None.
+
+    Errors about the request as a whole (invalid token, unknown pixel) point
+    at no event.
+    """
+    try:
+        error = response.json()["error"]
+    except (ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(error, dict):
+        return None
+    for key in ("error_user_msg", "error_user_title", "message"):
+        match = _EVENT_REFERENCE.search(str(error.get(key) or ""))
+        if match:
+            return int(match.group(1))
+    return None
+
+
+class MetaConfig(NamedTuple):
+    """Snapshot of the Meta Pixel / Conversions API settings."""
+
+    pixel_enabled: bool
+    pixel_id: str
+    enabled: bool
+    access_token: str
+    test_event_code: str
+
+
+class PostResult(NamedTuple):
+    """Outcome of one /events request."""
+
+    ok: bool
+    error: str = ""
+    status_code: int = None
+    # Whether the same request may succeed later (network, 5xx, throttling)
+    retryable: bool = False
+    # Seconds Meta asks to wait before calling again
+    retry_after: float = 0
+    # True when nothing was sent because the pixel's rate limit was reached
+    deferred: bool = False
+    # Body of Meta's response
+    response: str = ""
+    # Index of the event a rejected request failed on, if Meta says so
+    event_index: int = None
+
+
 class MetaConversionsApi(models.AbstractModel):
     """Helper model to send events to Meta (Facebook) Conversions API.
 
@@ -28,18 +90,48 @@ class MetaConversionsApi(models.AbstractModel):
     _description = "Meta Conversions API Helper"
 
     @api.model
-    def _get_config(self):
+    @tools.ormcache()
+    def _get_routing_table(self):
+        """Settings per website, as ``{website id: MetaConfig}``.
+
+        Key ``False`` holds the global settings, which also fill in the pixel,
+        token and test event code a website leaves empty. Cached per registry;
+        the cache is cleared whenever a system parameter or the Meta settings
+        of a website are written.
+        """
         ICP = self.env["ir.config_parameter"].sudo()
-        enabled = ICP.get_param("meta_capi.enabled") in (True, "True", "true", "1")
-        pixel_id = ICP.get_param("meta_capi.pixel_id")
-        access_token = ICP.get_param("meta_capi.access_token")
-        test_event_code = ICP.get_param("meta_capi.test_event_code")
-        return {
-            "enabled": enabled,
-            "pixel_id": pixel_id,
-            "access_token": access_token,
-            "test_event_code": test_event_code,
-        }
+        default = MetaConfig(
+            pixel_enabled=_is_true(ICP.get_param("meta_capi.pixel_enabled")),
+            pixel_id=ICP.get_param("meta_capi.pixel_id") or "",
+            enabled=_is_true(ICP.get_param("meta_capi.enabled")),
+            access_token=ICP.get_param("meta_capi.access_token") or "",
+            test_event_code=ICP.get_param("meta_capi.test_event_code") or "",
+        )
+        table = {False: default}
+        websites = self.env["website"].sudo().with_context(active_test=False).search_read(
+            [], ["meta_pixel_id", "meta_capi_access_token", "meta_capi_test_event_code"]
+        )
+        for website in websites:
+            table[website["id"]] = default._replace(
+                pixel_id=website["meta_pixel_id"] or default.pixel_id,
+                access_token=website["meta_capi_access_token"] or default.access_token,
+                test_event_code=website["meta_capi_test_event_code"] or default.test_event_code,
+            )
+        return frozendict(table)
+
+    @api.model
+    def _get_config(self, website_id=False):
+        """Return the settings of ``website_id`` (global ones by default) as a :class:`MetaConfig`."""
+        table = self._get_routing_table()
+        return table.get(website_id or False) or table[False]
+
+    @api.model
+    def _get_access_token(self, pixel_id):
+        """Access token to post the events of ``pixel_id``."""
+        for config in self._get_routing_table().values():
+            if config.pixel_id == pixel_id and config.access_token:
+                return config.access_token
+        return ""
 
     @api.model
     def send_event(
@@ -51,8 +143,12 @@ class MetaConversionsApi(models.AbstractModel):
         custom_data=None,
         test_event_code=None,
         raise_on_error=False,
+        event_source_url=None,
     ):
-        """Send a single event to Meta Conversions API.
+        """Queue a single event for delivery to Meta Conversions API.
+
+        The event is written to the ``meta.capi.event`` outbox and posted by a
+        background cron, so this call never waits on graph.facebook.com.
 
         :param event_name: e.g. 'PageView', 'Purchase', 'AddToCart'
         :param event_time: Unix timestamp (int). Defaults to now UTC.
@@ -61,72 +157,210 @@ class MetaConversionsApi(models.AbstractModel):
                           Values should follow Meta's requirements (usually SHA256-hashed).
         :param custom_data: Dict with business data (value, currency, content_ids, etc.).
         :param test_event_code: Optional string from Events Manager (overrides config if set).
-        :param raise_on_error: If True, raise UserError on HTTP errors; otherwise, log.
+        :param event_source_url: Optional URL of the page where the event happened.
+        :param raise_on_error: If True, raise UserError when the API is not configured;
+                               otherwise, log.
+        :return: the queued ``meta.capi.event`` record, or False if nothing was queued.
         """
-        config = self._get_config()
-        if not config["enabled"]:
-            _logger.info("Meta Conversions API disabled in configuration; skipping event.")
-            return False
-
-        pixel_id = config["pixel_id"]
-        access_token = config["access_token"]
-        if not pixel_id or not access_token:
+        events = self.send_events(
+            [{
+                "event_name": event_name,
+                "event_time": event_time,
+                "event_id": event_id,
+                "user_data": user_data,
+                "custom_data": custom_data,
+                "event_source_url": event_source_url,
+            }],
+            test_event_code=test_event_code,
+            raise_on_error=raise_on_error,
+        )
+        return events or False
+
+    @api.model
+    def send_events(self, batch, test_event_code=None, raise_on_error=False):
+        """Queue several events at once.
+
+        The queue cron groups them per pixel and posts them in chunks of up to
+        ``MAX_EVENTS_PER_REQUEST`` events per HTTP call.
+
+        :param batch: list of dicts accepting the keyword arguments of
+                      :meth:`send_event` (``event_name`` is required), and
+                      ``website_id``: the event then goes to that website's
+                      pixel (see :meth:`_get_routing_table`); ``res_model``
+                      and ``res_id``: the record the event is about (e.g.
+                      the sale order), kept in the outbox and the event log.
+        :param test_event_code: applied to every event of the batch.
+        :param raise_on_error: see :meth:`send_event`.
+        :return: the queued ``meta.capi.event`` records, in batch order. Their
+                 ``state`` and ``last_error`` report the outcome of each event
+                 once delivered. Empty if nothing was queued.
+
+        Events whose ``event_id`` was already sent to the same pixel (see
+        ``meta.capi.dedup``) are dropped and not returned.
+        """
+        Event = self.env["meta.capi.event"]
+        if not batch:
+            return Event
+
+        if not self._get_config().enabled:
+            metrics.trace(_logger, "Meta Conversions API disabled in configuration; skipping %s event(s).", len(batch))
+            return Event
+
+        now = int(time.time())
+        vals_list = []
+        unconfigured = 0
+        for values in batch:
+            values = dict(values)
+            res_model, res_id = values.pop("res_model", False), values.pop("res_id", False)
+            config = self._get_config(values.pop("website_id", False))
+            if not config.pixel_id or not config.access_token:
+                unconfigured += 1
+                continue
+            event = self._prepare_event(now=now, **values)
+            vals_list.append({
+                "event_name": event["event_name"],
+                "event_id": event.get("event_id"),
+                "event_time": event["event_time"],
+                "pixel_id": config.pixel_id,
+                # Prefer explicit call-time test_event_code, otherwise config
+                "test_event_code": test_event_code or config.test_event_code,
+                "payload": event,
+                "res_model": res_model,
+                "res_id": res_id,
+            })
+        if unconfigured:
             msg = _(
                 "Meta Conversions API is not fully configured. "
                 "Please set Pixel ID and Access Token in Website settings."
             )
             if raise_on_error:
                 raise UserError(msg)
-            _logger.warning(msg)
-            return False
-
-        url = f"https://graph.facebook.com/v17.0/{pixel_id}/events"
-        payload = {
-            "data": [
-                {
-                    "event_name": event_name,
-                    "event_time": int(event_time or time.time()),
-                    "event_id": event_id,
-                    "action_source": "website",
-                    "user_data": user_data or {},
-                    "custom_data": custom_data or {},
-                }
-            ]
+            _logger.warning("%s (%s event(s) skipped)", msg, unconfigured)
+        if not vals_list:
+            return Event
+
+        with metrics.measure("capi.enqueue", self.env):
+            vals_list = self._drop_duplicates(vals_list)
+            return Event._enqueue(vals_list) if vals_list else Event
+
+    @api.model
+    def _drop_duplicates(self, vals_list):
+        """Filter out the events already sent, or repeated within ``vals_list``."""
+        keys = [
+            dedup_key(vals["pixel_id"], vals["event_name"], vals["event_id"]) if vals["event_id"] else None
+            for vals in vals_list
+        ]
+        new_keys = self.env["meta.capi.dedup"].sudo()._claim({key for key in keys if key})
+        kept = []
+        for vals, key in zip(vals_list, keys):
+            if key:
+                if key not in new_keys:
+                    metrics.trace(
+                        _logger, "Meta CAPI: dropping duplicate %s event %s.", vals["event_name"], vals["event_id"]
+                    )
+                    continue
+                new_keys.discard(key)
+            kept.append(vals)
+        return kept
+
+    @api.model
+    def _prepare_event(
+        self, event_name, event_time=None, event_id=None, user_data=None, custom_data=None, now=None,
+        event_source_url=None,
+    ):
+        """Build one entry of the ``data`` list posted to the /events edge."""
+        event = {
+            "event_name": event_name,
+            "event_time": int(event_time or now or time.time()),
+            "event_id": event_id,
+            "event_source_url": event_source_url,
+            "action_source": "website",
+            "user_data": user_data or {},
+            "custom_data": custom_data or {},
         }
 
         # Remove empty keys that Meta may reject
-        for event in payload["data"]:
-            if not event["event_id"]:
-                event.pop("event_id")
-
-        params = {"access_token": access_token}
-
-        # Prefer explicit call-time test_event_code, otherwise config
-        tec = test_event_code or config.get("test_event_code")
-        if tec:
-            params["test_event_code"] = tec
-
-        try:
-            response = requests.post(url, json=payload, params=params, timeout=10)
-            if not response.ok:
-                _logger.error(
-                    "Meta Conversions API error [%s]: %s",
-                    response.status_code,
-                    response.text,
-                )
-                if raise_on_error:
-                    raise UserError(
-                        _("Meta Conversions API error: %s") % response.text
-                    )
-                return False
+        for key in ("event_id", "event_source_url"):
+            if not event[key]:
+                event.pop(key)
+        return event
 
-            _logger.info("Meta Conversions API event sent successfully: %s", response.text)
-            return True
-        except Exception as e:  # pragma: no cover - network failures
-            _logger.exception("Failed to send event to Meta Conversions API: %s", e)
-            if raise_on_error:
-                raise UserError(
-                    _("Failed to send event to Meta Conversions API: %s") % e
-                )
-            return False
+    @api.model
+    def _log_entries(self, pixel_id, events, result):
+        """``graph.api.event.log`` entries of the ``meta.capi.event`` records
+        posted in one /events request.
+        """
+        if result.deferred or (result.status_code is None and not result.retryable):
+            # Nothing was sent: rate limit reached, or pixel not configured
+            return []
+        return [{
+            "channel": "capi",
+            "res_model": event.res_model or None,
+            "res_id": event.res_id or None,
+            "event_id": event.event_id or None,
+            "destination": pixel_id,
+            "status_code": result.status_code,
+            "ok": result.ok,
+            "payload": event.payload,
+            "response": result.response or result.error,
+        } for event in events]
+
+
+def post_events(dbname, pixel_id, access_token, events, test_event_code=None):
+    """POST ``events`` to the /events edge of ``pixel_id``.
+
+    Calls are paced by the pixel's token bucket; the request is not made
+    (``deferred``) if the bucket would make us wait too long. Uses no cursor:
+    safe to run in ``dispatch`` threads.
+
+    :rtype: PostResult
+    """
+    if not pixel_id or not access_token:
+        return PostResult(False, "Missing Pixel ID or Access Token.")
+
+    destination = rate_limit.bucket("capi", pixel_id)
+    if not destination.acquire(max_wait=MAX_THROTTLE_WAIT):
+        return PostResult(
+            False,
+            f"Rate limit reached for pixel {pixel_id}; deferred.",
+            retryable=True,
+            retry_after=destination.wait_time(),
+            deferred=True,
+        )
+
+    url = f"https://graph.facebook.com/v17.0/{pixel_id}/events"
+    params = {"access_token": access_token}
+    if test_event_code:
+        params["test_event_code"] = test_event_code
+
+    try:
+        with metrics.timer(dbname, "capi.send"):
+            response = http_session.get_session().post(
+                url, json={"data": events}, params=params, timeout=10
+            )
+    except Exception as e:  # pragma: no cover - network failures
+        _logger.warning("Failed to send events to Meta Conversions API: %s", e)
+        return PostResult(False, str(e), retryable=True)
+
+    throttled, retry_after = rate_limit.observe(destination, response)
+    if not response.ok:
+        metrics.record(dbname, "capi.send", calls=0, errors=1)
+        _logger.error(
+            "Meta Conversions API error [%s]: %s",
+            response.status_code,
+            response.text,
+        )
+        return PostResult(
+            False,
+            f"[{response.status_code}] {response.text}",
+            response.status_code,
+            retryable=throttled or rate_limit.is_retryable(response.status_code),
+            retry_after=retry_after,
+            response=response.text,
+            event_index=event_error_index(response),
+        )
 
+    metrics.trace(
+        _logger, "Meta Conversions API: %s event(s) sent successfully: %s", len(events), response.text
+    )
+    return PostResult(True, status_code=response.status_code, response=response.text)
@@ -33,6 +33,20 @@ class ResConfigSettings(models.TransientModel):
         help="Optional test code from Events Manager, used while validating events.",
     )
 
+    # Per-website overrides (empty: use the global settings above)
+    website_meta_pixel_id = fields.Char(
+        related="website_id.meta_pixel_id",
+        readonly=False,
+    )
+    website_meta_capi_access_token = fields.Char(
+        related="website_id.meta_capi_access_token",
+        readonly=False,
+    )
+    website_meta_capi_test_event_code = fields.Char(
+        related="website_id.meta_capi_test_event_code",
+        readonly=False,
+    )
+
     @api.model
     def get_values(self):
         """Ensure backward compatibility if config parameters are missing."""
@@ -49,3 +63,8 @@ class ResConfigSettings(models.TransientModel):
         )
         return res
 
+
+    def set_values(self):
+        super().set_values()
+        # Drop the cached meta.conversions.api config snapshot
+        self.env.registry.clear_cache()
@@ -0,0 +1,44 @@
+from odoo import api, fields, models
+
+from ..tools import user_data
+
+
+class ResPartner(models.Model):
+    _inherit = "res.partner"
+
+    meta_capi_user_data = fields.Json(
+        string="Meta CAPI Hashed Identifiers",
+        compute="_compute_meta_capi_user_data",
+        store=True,
+        groups="base.group_system",
+        help="Normalized, SHA-256 hashed customer identifiers sent as Meta Conversions API "
+             "user_data. Recomputed only when the underlying contact fields change.",
+    )
+
+    @api.depends(
+        "name", "is_company", "email", "phone", "mobile", "city", "zip",
+        "state_id.code", "country_id.code", "country_id.phone_code",
+    )
+    def _compute_meta_capi_user_data(self):
+        rows = [(partner._meta_capi_raw_user_data(), partner.country_id.phone_code) for partner in self]
+        for partner, data in zip(self, user_data.hash_user_data_batch(rows)):
+            partner.meta_capi_user_data = data
+
+    def _meta_capi_raw_user_data(self):
+        """Raw (not yet normalized) identifiers of the partner, keyed like ``user_data``."""
+        self.ensure_one()
+        first_name = last_name = False
+        if self.name and not self.is_company:
+            names = self.name.split()
+            first_name, last_name = names[0], (names[-1] if len(names) > 1 else False)
+        return {
+            "em": self.email,
+            "ph": self.mobile or self.phone,
+            "fn": first_name,
+            "ln": last_name,
+            "ct": self.city,
+            "st": self.state_id.code,
+            "zp": self.zip,
+            "country": self.country_id.code,
+            "external_id": str(self.id),
+        }
@@ -1,69 +1,115 @@
-import hashlib
 import logging
+from datetime import timezone
 
-from odoo import models
+from odoo import api, fields, models
 
-_logger = logging.getLogger(__name__)
+from odoo.addons.ih_graph_api.tools import metrics
 
+from ..tools import user_data as meta_user_data
 
-def _hash_norm(value):
-    """Normalize and SHA256-hash a string for Meta user_data."""
-    if not value:
-        return False
-    v = str(value).strip().lower()
-    if not v:
-        return False
-    return hashlib.sha256(v.encode("utf-8")).hexdigest()
+_logger = logging.getLogger(__name__)
 
 
 class SaleOrder(models.Model):
     _inherit = "sale.order"
 
-    def _meta_capi_send_purchase_event(self):
+    meta_capi_commerce_data = fields.Json(
+        string="Meta Commerce Data",
+        compute="_compute_meta_capi_commerce_data",
+        store=True,
+        help="custom_data of the order's Meta events (content_ids, contents, num_items, "
+             "value, currency), shared by the Pixel templates and the Conversions API. "
+             "Recomputed only when the order lines or totals change.",
+    )
+
+    @api.depends(
+        "order_line.product_id", "order_line.product_uom_qty", "order_line.price_unit",
+        "amount_total", "currency_id",
+    )
+    def _compute_meta_capi_commerce_data(self):
+        for order in self:
+            content_ids, contents, num_items = [], [], 0
+            for line in order.order_line:
+                num_items += line.product_uom_qty
+                if line.product_id:
+                    content_ids.append(line.product_id.id)
+                    contents.append({
+                        "id": line.product_id.id,
+                        "quantity": line.product_uom_qty,
+                        "item_price": line.price_unit,
+                    })
+            order.meta_capi_commerce_data = {
+                "content_ids": content_ids,
+                "contents": contents,
+                "content_type": "product",
+                "num_items": num_items,
+                "value": float(order.amount_total),
+                "currency": order.currency_id.name,
+            }
+
+    def _meta_capi_event_id(self, event_name):
+        """Event id shared by the Pixel and Conversions API events of this order.
+
+        Deterministic, so that Meta counts the browser and server events once,
+        and a repeated server send is dropped by ``meta.capi.dedup``.
+        """
+        self.ensure_one()
+        return f"{event_name.lower()}_{self.id}"
+
+    def _meta_capi_send_purchase_event(self, use_order_date=False):
         """Send a Purchase event to Meta CAPI for website orders.
         
         This works together with the client-side Pixel Purchase event.
-        Event deduplication is handled by using a consistent event_id.
+        Event deduplication is handled by using a consistent event_id
+        (see :meth:`_meta_capi_event_id`).
+        The events of all orders in ``self`` are queued as a single batch.
+
+        :param use_order_date: date the events at the order date instead of
+                               now (replay of past orders).
+        :return: the queued ``meta.capi.event`` records.
         """
-        meta_api = self.env["meta.conversions.api"]
+        return self.env["meta.conversions.api"].send_events(
+            self._meta_capi_purchase_batch(use_order_date)
+        )
 
+    def _meta_capi_purchase_batch(self, use_order_date=False):
+        """Purchase events of the website orders of ``self``, as a
+        :meth:`~meta.conversions.api.send_events` batch.
+        """
+        batch = []
         for order in self:
             # Only website orders, skip backend-only orders
             if not order.website_id:
                 continue
 
-            # Build user_data from partner info (email / phone)
-            user_data = {
-                "em": _hash_norm(order.partner_id.email),
-                "ph": _hash_norm(order.partner_id.mobile or order.partner_id.phone),
-            }
-            # Remove empty values
-            user_data = {k: v for k, v in user_data.items() if v}
-            if not user_data:
-                _logger.info(
-                    "Meta CAPI: skipping order %s because no usable customer identifiers were found.",
+            # Hashed partner identifiers, cached on the partner
+            user_data = meta_user_data.build_user_data(
+                order.partner_id.sudo().meta_capi_user_data
+            )
+            if not {"em", "ph"} & set(user_data):
+                metrics.trace(
+                    _logger, "Meta CAPI: skipping order %s because no usable customer identifiers were found.",
                     order.id,
                 )
                 continue
 
-            # Generate consistent event_id for deduplication with Pixel
-            # Format matches the client-side: purchase_<order_id>_<timestamp>
-            event_id = f"purchase_{order.id}_{int(order.date_order.timestamp() * 1000) if order.date_order else ''}"
+            # Same event_id as the browser event (meta_pixel_purchase)
+            event_id = order._meta_capi_event_id("Purchase")
 
-            custom_data = {
-                "currency": order.currency_id.name,
-                "value": float(order.amount_total),
-                "content_ids": [line.product_id.id for line in order.order_line if line.product_id],
-                "content_type": "product",
-                "num_items": sum(line.product_uom_qty for line in order.order_line),
-            }
-
-            meta_api.send_event(
-                event_name="Purchase",
-                event_id=event_id,
-                user_data=user_data,
-                custom_data=custom_data,
-            )
+            batch.append({
+                "website_id": order.website_id.id,
+                "event_name": "Purchase",
+                "event_time": (
+                    int(order.date_order.replace(tzinfo=timezone.utc).timestamp())
+                    if use_order_date and order.date_order else None
+                ),
+                "event_id": event_id,
+                "user_data": user_data,
+                "custom_data": order.meta_capi_commerce_data,
+                "res_model": "sale.order",
+                "res_id": order.id,
+            })
+        return batch
 
     def action_confirm(self):
         """On order confirmation, also send a Purchase event to Meta CAPI."""
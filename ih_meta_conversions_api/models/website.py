@@ -0,0 +1,35 @@
+from odoo import api, fields, models
+
+# Fields feeding meta.conversions.api's routing table
+META_WEBSITE_FIELDS = ("meta_pixel_id", "meta_capi_access_token", "meta_capi_test_event_code")
+
+
+class Website(models.Model):
+    _inherit = "website"
+
+    meta_pixel_id = fields.Char(
+        string="Meta Pixel ID",
+        help="Pixel of this website; leave empty to use the global Pixel ID.",
+    )
+    meta_capi_access_token = fields.Char(
+        string="Meta Conversions API Access Token",
+        groups="base.group_system",
+        help="Access token of this website's pixel; leave empty to use the global one.",
+    )
+    meta_capi_test_event_code = fields.Char(
+        string="Meta Test Event Code",
+        groups="base.group_system",
+    )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        websites = super().create(vals_list)
+        if any(key in vals for vals in vals_list for key in META_WEBSITE_FIELDS):
+            self.env.registry.clear_cache()
+        return websites
+
+    def write(self, vals):
+        res = super().write(vals)
+        if any(key in vals for key in META_WEBSITE_FIELDS):
+            self.env.registry.clear_cache()
+        return res
@@ -0,0 +1,110 @@
+/**
+ * Meta Pixel bootstrap.
+ *
+ * Loads fbevents.js and sends the events described by the JSON data islands
+ * rendered by the server (<script type="application/json" class="o_meta_pixel_data">):
+ *
+ *     {"pixel_id": "...", "events": [{"name": "Purchase", "data": {...}, "event_id": "..."}],
+ *      "add_to_cart": {...}}
+ *
+ * Islands are merged; "add_to_cart" is the custom_data tracked when the
+ * product page's Add to Cart button is clicked. With a "relay" island
+ * ({"relay": {"url": "...", "events": ["ViewContent", ...]}}), the listed events
+ * are also posted to that URL, with the same event_id, to be sent server-side.
+ * Events listed in "server_events" ({"server_events": ["AddToCart"]}) are sent by
+ * the server itself and not tracked by the browser, so Meta does not count them twice.
+ */
+(function () {
+    "use strict";
+
+    function readIslands() {
+        var merged = { pixel_id: null, events: [], add_to_cart: null, relay: null, server_events: [] };
+        document.querySelectorAll("script.o_meta_pixel_data").forEach(function (node) {
+            var data;
+            try {
+                data = JSON.parse(node.textContent);
+            } catch (e) {
+                return;
+            }
+            merged.pixel_id = merged.pixel_id || data.pixel_id;
+            merged.events = merged.events.concat(data.events || []);
+            merged.add_to_cart = data.add_to_cart || merged.add_to_cart;
+            merged.relay = data.relay || merged.relay;
+            merged.server_events = merged.server_events.concat(data.server_events || []);
+        });
+        return merged;
+    }
+
+    function loadFbq() {
+        if (window.fbq) {
+            return;
+        }
+        var n = (window.fbq = function () {
+            n.callMethod ? n.callMethod.apply(n, arguments) : n.queue.push(arguments);
+        });
+        if (!window._fbq) {
+            window._fbq = n;
+        }
+        n.push = n;
+        n.loaded = true;
+        n.version = "2.0";
+        n.queue = [];
+        var script = document.createElement("script");
+        script.async = true;
+        script.src = "https://connect.facebook.net/en_US/fbevents.js";
+        document.head.appendChild(script);
+    }
+
+    function track(event) {
+        var options = event.event_id ? { eventID: event.event_id } : {};
+        window.fbq("track", event.name, event.data || {}, options);
+    }
+
+    function relay(config, events) {
+        if (!config.relay || !navigator.sendBeacon) {
+            return;
+        }
+        var relayed = events.filter(function (event) {
+            return config.relay.events.indexOf(event.name) !== -1;
+        });
+        if (!relayed.length) {
+            return;
+        }
+        relayed.forEach(function (event) {
+            event.event_id =
+                event.event_id ||
+                event.name.toLowerCase() + "_" + Date.now().toString(36) + Math.random().toString(36).slice(2, 10);
+            event.url = window.location.href;
+        });
+        navigator.sendBeacon(
+            config.relay.url,
+            new Blob([JSON.stringify({ events: relayed })], { type: "application/json" })
+        );
+    }
+
+    function start() {
+        var config = readIslands();
+        if (!config.pixel_id) {
+            return;
+        }
+        loadFbq();
+        window.fbq("init", config.pixel_id);
+        relay(config, config.events);
+        config.events.forEach(track);
+        if (config.add_to_cart && config.server_events.indexOf("AddToCart") === -1) {
+            document.addEventListener("click", function (ev) {
+                if (ev.target.closest && ev.target.closest("#add_to_cart")) {
+                    var event = { name: "AddToCart", data: config.add_to_cart };
+                    relay(config, [event]);
+                    track(event);
+                }
+            });
+        }
+    }
+
+    if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", start);
+    } else {
+        start();
+    }
+})();
@@ -0,0 +1,4 @@
+from . import test_meta_capi_backfill
+from . import test_meta_capi_dedup
+from . import test_meta_capi_event
+from . import test_user_data
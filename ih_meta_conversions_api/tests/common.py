@@ -0,0 +1,84 @@
+import json
+import threading
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import requests
+
+from odoo.tests.common import TransactionCase
+
+from odoo.addons.ih_graph_api.tools import http_session
+
+PIXEL_ID = "111111"
+
+
+def graph_response(status=200, body=None):
+    """``requests.Response`` as returned by the /events edge."""
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(body if body is not None else {"events_received": 1}).encode()
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+
+def graph_error(status, message, code=100):
+    return graph_response(status, {"error": {"message": message, "type": "OAuthException", "code": code}})
+
+
+class MockGraphSession:
+    """Stand-in for the pooled session: records the posted events, answers
+    with the queued responses (or raises the queued exceptions).
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def post(self, url, json=None, params=None, timeout=None):
+        with self._lock:
+            self.requests.append(json["data"])
+            response = self.responses.pop(0) if self.responses else graph_response()
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class MetaCapiCase(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        ICP = cls.env["ir.config_parameter"].sudo()
+        ICP.set_param("meta_capi.enabled", "True")
+        ICP.set_param("meta_capi.pixel_id", PIXEL_ID)
+        ICP.set_param("meta_capi.access_token", "test_token")
+        ICP.set_param("meta_capi.test_event_code", "")
+        cls.env["website"].search([]).write({
+            "meta_pixel_id": False,
+            "meta_capi_access_token": False,
+            "meta_capi_test_event_code": False,
+        })
+        cls.env.registry.clear_cache()
+        cls.api = cls.env["meta.conversions.api"]
+        cls.Event = cls.env["meta.capi.event"]
+
+    def _send_events(self, count, prefix="test"):
+        return self.api.send_events([{
+            "event_name": "Purchase",
+            "event_id": f"{prefix}_{i}",
+            "user_data": {"em": "0" * 64},
+            "custom_data": {"currency": "USD", "value": 10.0},
+        } for i in range(count)])
+
+    @contextmanager
+    def mock_graph(self, *responses):
+        """Answer the /events requests made during the block with ``responses``
+        (200 once they are used up).
+
+        :return: the :class:`MockGraphSession`, whose ``requests`` lists the
+                 events posted by each request
+        """
+        session = MockGraphSession(responses)
+        with patch.object(http_session, "get_session", return_value=session):
+            yield session
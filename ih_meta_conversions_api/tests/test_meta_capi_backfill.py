@@ -0,0 +1,70 @@
+from datetime import timedelta, timezone
+
+from odoo import fields
+from odoo.exceptions import UserError
+from odoo.tests import tagged
+
+from .common import PIXEL_ID, MetaCapiCase
+
+# Pixel of the test website only, so that demo orders are not replayed
+BACKFILL_PIXEL_ID = "222222"
+
+
+@tagged("post_install", "-at_install")
+class TestMetaCapiBackfill(MetaCapiCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.website = cls.env["website"].create({"name": "Backfill Shop", "meta_pixel_id": BACKFILL_PIXEL_ID})
+        partner = cls.env["res.partner"].create({"name": "Buyer", "email": "buyer@example.com"})
+        now = fields.Datetime.now()
+        cls.orders = cls.env["sale.order"].create([{
+            "partner_id": partner.id,
+            "website_id": cls.website.id,
+        } for _i in range(5)])
+        cls.orders.write({"state": "sale", "date_order": now - timedelta(days=1)})
+        cls.old_order = cls.orders[0].copy({"website_id": cls.website.id})
+        cls.old_order.write({"state": "sale", "date_order": now - timedelta(days=30)})
+        cls.backend_order = cls.orders[0].copy({"website_id": False})
+        cls.backend_order.write({"state": "sale", "date_order": now})
+
+    def _backfill(self):
+        return self.env["meta.capi.backfill"].create({"pixel_id": BACKFILL_PIXEL_ID})
+
+    def _event_order_ids(self):
+        events = self.Event.search([
+            ("pixel_id", "=", BACKFILL_PIXEL_ID),
+            ("res_model", "=", "sale.order"),
+            ("event_name", "=", "Purchase"),
+        ])
+        return set(events.mapped("res_id"))
+
+    def test_default_pixel(self):
+        self.assertEqual(self.env["meta.capi.backfill"].create({}).pixel_id, PIXEL_ID)
+
+    def test_run(self):
+        backfill = self._backfill()
+        self.assertEqual(backfill.run(chunk_size=2), 5)
+        self.assertEqual(backfill.state, "done")
+        self.assertEqual(backfill.last_order_id, max(self.orders.ids))
+        self.assertEqual(self._event_order_ids(), set(self.orders.ids))
+        # Dated at the order date, not now
+        event = self.Event.search([("res_model", "=", "sale.order"), ("res_id", "=", self.orders[0].id)])
+        date_order = self.orders[0].date_order.replace(tzinfo=timezone.utc)
+        self.assertEqual(event.event_time, int(date_order.timestamp()))
+
+    def test_resume_from_checkpoint(self):
+        backfill = self._backfill()
+        backfill.write({"last_order_id": self.orders[2].id, "event_count": 3})
+        self.assertEqual(backfill.run(chunk_size=1), 5)
+        self.assertEqual(self._event_order_ids(), set(self.orders[3:].ids))
+
+    def test_replay_is_deduplicated(self):
+        self._backfill().run()
+        self.assertEqual(self._backfill().run(), 0)
+
+    def test_unrouted_pixel(self):
+        backfill = self.env["meta.capi.backfill"].create({"pixel_id": "999999"})
+        with self.assertRaises(UserError):
+            backfill.run()
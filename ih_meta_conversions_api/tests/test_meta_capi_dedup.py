@@ -0,0 +1,48 @@
+from odoo.tests import tagged
+
+from .common import MetaCapiCase, graph_error
+
+
+@tagged("post_install", "-at_install")
+class TestMetaCapiDedup(MetaCapiCase):
+
+    def test_claim_and_release(self):
+        Dedup = self.env["meta.capi.dedup"]
+        self.assertEqual(Dedup._claim({"aaaa", "bbbb"}), {"aaaa", "bbbb"})
+        self.assertEqual(Dedup._claim({"bbbb", "cccc"}), {"cccc"})
+        Dedup._release({"bbbb"})
+        self.assertEqual(Dedup._claim({"bbbb"}), {"bbbb"})
+        self.assertEqual(Dedup._claim(set()), set())
+
+    def test_repeated_event_is_dropped(self):
+        self.assertEqual(len(self._send_events(2)), 2)
+        self.assertFalse(self._send_events(2))
+        # Repeated within one batch
+        batch = [{"event_name": "Purchase", "event_id": "twice"}] * 2
+        self.assertEqual(len(self.api.send_events(batch)), 1)
+        # Events without event_id are never deduplicated
+        batch = [{"event_name": "PageView"}] * 2
+        self.assertEqual(len(self.api.send_events(batch)), 2)
+
+    def test_failed_event_can_be_sent_again(self):
+        events = self._send_events(1)
+        with self.mock_graph(graph_error(400, "Invalid OAuth access token.", code=190)):
+            self.Event._cron_process_queue()
+        self.assertEqual(events.state, "failed")
+        self.assertEqual(len(self._send_events(1)), 1)
+
+    def test_rescheduled_event_keeps_its_key(self):
+        self._send_events(1)
+        with self.mock_graph(graph_error(503, "Service unavailable", code=2)):
+            self.Event._cron_process_queue()
+        self.assertFalse(self._send_events(1))
+
+    def test_purchase_event_id_matches_the_pixel(self):
+        order = self.env["sale.order"].create({
+            "partner_id": self.env["res.partner"].create({"name": "Buyer", "email": "buyer@example.com"}).id,
+            "website_id": self.env["website"].search([], limit=1).id,
+        })
+        batch = order._meta_capi_purchase_batch()
+        self.assertEqual(batch[0]["event_id"], f"purchase_{order.id}")
+        self.assertEqual(len(order._meta_capi_send_purchase_event()), 1)
+        self.assertFalse(order._meta_capi_send_purchase_event())
@@ -0,0 +1,86 @@
+from unittest.mock import patch
+
+import requests
+
+from odoo.tests import tagged
+
+from odoo.addons.ih_meta_conversions_api.models import meta_capi_event
+
+from .common import MetaCapiCase, graph_error
+
+
+@tagged("post_install", "-at_install")
+class TestMetaCapiOutbox(MetaCapiCase):
+
+    def test_send_in_chunks(self):
+        events = self._send_events(5)
+        self.assertEqual(set(events.mapped("state")), {"pending"})
+        with patch.object(meta_capi_event, "MAX_EVENTS_PER_REQUEST", 2), self.mock_graph() as graph:
+            self.Event._cron_process_queue()
+        self.assertEqual([len(data) for data in graph.requests], [2, 2, 1])
+        self.assertEqual(
+            [event["event_id"] for data in graph.requests for event in data],
+            events.mapped("event_id"),
+        )
+        self.assertEqual(set(events.mapped("state")), {"sent"})
+        self.assertTrue(all(events.mapped("sent_date")))
+
+    def test_invalid_event_is_dropped_and_the_rest_posted_again(self):
+        events = self._send_events(3)
+        rejected = graph_error(400, "Invalid parameter: data[1].user_data is missing")
+        with self.mock_graph(rejected) as graph:
+            self.Event._cron_process_queue()
+        self.assertEqual(len(graph.requests), 2)
+        self.assertEqual(
+            [event["event_id"] for event in graph.requests[1]],
+            [events[0].event_id, events[2].event_id],
+        )
+        self.assertEqual(events.mapped("state"), ["sent", "failed", "sent"])
+        self.assertIn("data[1]", events[1].last_error)
+        self.assertEqual(events[1].attempt_count, 1)
+
+    def test_request_error_fails_the_chunk(self):
+        events = self._send_events(3)
+        with self.mock_graph(graph_error(400, "Invalid OAuth access token.", code=190)) as graph:
+            self.Event._cron_process_queue()
+        self.assertEqual(len(graph.requests), 1)
+        self.assertEqual(set(events.mapped("state")), {"failed"})
+
+    def test_server_error_is_rescheduled(self):
+        events = self._send_events(2)
+        with self.mock_graph(graph_error(503, "Service unavailable", code=2)):
+            self.Event._cron_process_queue()
+        self.assertEqual(set(events.mapped("state")), {"pending"})
+        self.assertEqual(set(events.mapped("attempt_count")), {1})
+        self.assertTrue(all(events.mapped("next_attempt_date")))
+
+        # Not retried before its next attempt date
+        with self.mock_graph() as graph:
+            self.Event._cron_process_queue()
+        self.assertFalse(graph.requests)
+
+    def test_network_error_is_rescheduled(self):
+        events = self._send_events(1)
+        with self.mock_graph(requests.ConnectionError("connection reset")):
+            self.Event._cron_process_queue()
+        self.assertEqual(events.state, "pending")
+        self.assertEqual(events.attempt_count, 1)
+
+    def test_attempts_exhausted(self):
+        events = self._send_events(1)
+        events.attempt_count = meta_capi_event.MAX_ATTEMPTS - 1
+        with self.mock_graph(graph_error(503, "Service unavailable", code=2)):
+            self.Event._cron_process_queue()
+        self.assertEqual(events.state, "failed")
+        self.assertFalse(events.next_attempt_date)
+
+    def test_retry_action(self):
+        events = self._send_events(1)
+        with self.mock_graph(graph_error(400, "Invalid OAuth access token.", code=190)):
+            self.Event._cron_process_queue()
+        events.action_retry()
+        self.assertEqual(events.state, "pending")
+        self.assertEqual(events.attempt_count, 0)
+        with self.mock_graph():
+            self.Event._cron_process_queue()
+        self.assertEqual(events.state, "sent")
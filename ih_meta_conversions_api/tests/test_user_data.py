@@ -0,0 +1,96 @@
+from unittest import skipIf
+from unittest.mock import patch
+
+from odoo.tests.common import BaseCase
+
+from odoo.addons.ih_meta_conversions_api.tools import user_data
+from odoo.addons.ih_meta_conversions_api.tools.user_data import (
+    build_user_data, hash_user_data, hash_user_data_batch, normalize, sha256,
+)
+
+
+class TestNormalize(BaseCase):
+
+    def test_email(self):
+        self.assertEqual(normalize("em", "  John.Doe@Example.COM "), "john.doe@example.com")
+
+    def test_names(self):
+        self.assertEqual(normalize("fn", "Jean-Luc"), "jeanluc")
+        self.assertEqual(normalize("ln", " O'Brien 2nd"), "obriennd")
+        self.assertEqual(normalize("fn", "ÉMILE"), "émile")
+
+    def test_city_state_country(self):
+        self.assertEqual(normalize("ct", "New York"), "newyork")
+        self.assertEqual(normalize("st", "CA"), "ca")
+        self.assertEqual(normalize("country", " US "), "us")
+
+    def test_zip(self):
+        self.assertEqual(normalize("zp", "94107-1234", country="us"), "94107")
+        self.assertEqual(normalize("zp", "SW1A 1AA", country="gb"), "sw1a1aa")
+        self.assertEqual(normalize("zp", "94107-1234"), "941071234")
+
+    def test_empty(self):
+        for key in user_data.HASHED_KEYS:
+            self.assertEqual(normalize(key, False), "")
+            self.assertEqual(normalize(key, ""), "")
+        self.assertEqual(normalize("ph", "n/a"), "")
+
+
+class TestNormalizePhone(BaseCase):
+
+    def test_international(self):
+        self.assertEqual(normalize("ph", "+1 (650) 253-0000", phone_code=33), "16502530000")
+        self.assertEqual(normalize("ph", "0033 6 12 34 56 78", phone_code=1), "33612345678")
+
+    def test_national_prefixed(self):
+        # trunk zero dropped, country code added
+        self.assertEqual(normalize("ph", "06 12 34 56 78", phone_code=33), "33612345678")
+        self.assertEqual(normalize("ph", "(650) 253-0000", phone_code=1), "16502530000")
+
+    def test_national_without_country(self):
+        self.assertEqual(normalize("ph", "06 12 34 56 78"), "612345678")
+
+    def test_already_prefixed(self):
+        self.assertEqual(normalize("ph", "1 650 253 0000", phone_code=1), "16502530000")
+        self.assertEqual(normalize("ph", "33 6 12 34 56 78", phone_code=33), "33612345678")
+
+    @skipIf(user_data.phonenumbers is None, "phonenumbers is not installed")
+    def test_national_starting_with_country_code(self):
+        # an Indian mobile starting with 91 is not already prefixed
+        self.assertEqual(normalize("ph", "91234 56789", phone_code=91), "919123456789")
+        self.assertEqual(normalize("ph", "91 91234 56789", phone_code=91), "919123456789")
+
+    def test_national_starting_with_country_code_fallback(self):
+        # without phonenumbers the number is ambiguous and kept as typed
+        with patch.object(user_data, "phonenumbers", None):
+            self.assertEqual(normalize("ph", "91234 56789", phone_code=91), "9123456789")
+
+
+class TestHashing(BaseCase):
+
+    def test_hash_user_data(self):
+        hashed = hash_user_data(
+            {"em": "John@Example.com", "fn": "John", "ph": "06 12 34 56 78", "ct": False},
+            phone_code=33,
+        )
+        self.assertEqual(hashed, {
+            "em": sha256("john@example.com"),
+            "fn": sha256("john"),
+            "ph": sha256("33612345678"),
+        })
+
+    def test_batch_uses_each_row_country(self):
+        rows = [
+            ({"zp": "94107-1234", "country": "US"}, None),
+            ({"zp": "94107-1234", "country": "CA"}, None),
+        ]
+        self.assertEqual(hash_user_data_batch(rows), [
+            {"zp": sha256("94107"), "country": sha256("us")},
+            {"zp": sha256("941071234"), "country": sha256("ca")},
+        ])
+
+    def test_build_user_data(self):
+        user = build_user_data(
+            {"em": "digest"}, fbp="fb.1.1.1", client_ip_address="", unknown="dropped"
+        )
+        self.assertEqual(user, {"em": "digest", "fbp": "fb.1.1.1"})
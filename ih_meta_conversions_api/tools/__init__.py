@@ -0,0 +1 @@
+from . import user_data
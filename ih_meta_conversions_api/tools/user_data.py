@@ -0,0 +1,149 @@
+"""Normalization and hashing of customer identifiers for Meta ``user_data``.
+
+Meta matches events on SHA-256 hashes of normalized identifiers; each key has
+its own normalization rules:
+https://developers.facebook.com/docs/marketing-api/conversions-api/parameters/customer-information-parameters
+
+``fbp``, ``fbc``, ``client_ip_address`` and ``client_user_agent`` are sent as is.
+"""
+import hashlib
+import re
+from functools import lru_cache
+
+try:
+    import phonenumbers
+except ImportError:
+    phonenumbers = None
+
+HASHED_KEYS = ("em", "ph", "fn", "ln", "ct", "st", "zp", "country", "external_id")
+PLAIN_KEYS = ("fbp", "fbc", "client_ip_address", "client_user_agent")
+
+_NON_DIGITS = re.compile(r"\D")
+_NON_LETTERS = re.compile(r"[\W\d_]", re.UNICODE)
+_NON_ALNUM = re.compile(r"[\W_]", re.UNICODE)
+
+
+def _is_valid_number(digits):
+    try:
+        return phonenumbers.is_valid_number(phonenumbers.parse(f"+{digits}"))
+    except phonenumbers.NumberParseException:
+        return False
+
+
+def _has_country_code(national, phone_code):
+    """Whether ``national`` (a number typed without ``+`` nor trunk zero)
+    already starts with the country code ``phone_code``.
+
+    Starting with the code's digits is not enough: an Indian mobile such as
+    ``9123456789`` starts with 91. With ``phonenumbers`` installed, the number
+    is taken as prefixed unless only the prefixed reading is a valid number;
+    without it, a number starting with the code is kept as typed.
+    """
+    code = str(phone_code)
+    if not national.startswith(code):
+        return False
+    if phonenumbers is None:
+        return True
+    return _is_valid_number(national) or not _is_valid_number(code + national)
+
+
+def _normalize_phone(value, phone_code=None):
+    """Digits only, with the country code and without leading zeros."""
+    raw = value.strip()
+    digits = _NON_DIGITS.sub("", raw)
+    if not digits:
+        return ""
+    if raw.startswith("+"):
+        return digits
+    if digits.startswith("00"):
+        return digits[2:].lstrip("0")
+    national = digits.lstrip("0")
+    if phone_code and (digits.startswith("0") or not _has_country_code(national, phone_code)):
+        return f"{phone_code}{national}"
+    return national
+
+
+def _normalize_zip(value, country=None):
+    zp = _NON_ALNUM.sub("", value).lower()
+    if country == "us":
+        zp = zp[:5]
+    return zp
+
+
+def normalize(key, value, phone_code=None, country=None):
+    """Normalize ``value`` for the ``user_data`` key ``key``.
+
+    :param phone_code: country calling code prepended to national phone numbers.
+    :param country: ISO 3166-1 alpha-2 code, used for country-specific zip rules.
+    :return: the normalized string, empty if nothing usable is left.
+    """
+    if not value:
+        return ""
+    value = str(value)
+    if key == "em":
+        return value.strip().lower()
+    if key == "ph":
+        return _normalize_phone(value, phone_code)
+    if key in ("fn", "ln"):
+        return _NON_LETTERS.sub("", value.lower())
+    if key in ("ct", "st"):
+        return _NON_ALNUM.sub("", value.lower())
+    if key == "zp":
+        return _normalize_zip(value, country)
+    if key == "country":
+        return value.strip().lower()[:2]
+    return value.strip().lower()
+
+
+@lru_cache(maxsize=65536)
+def sha256(value):
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def hash_values(values):
+    """Hash many normalized values at once; each distinct value is hashed once.
+
+    :return: list of hex digests (False for empty values), in input order.
+    """
+    digests = {value: sha256(value) for value in set(values) if value}
+    return [digests.get(value, False) for value in values]
+
+
+def normalize_user_data(raw, phone_code=None):
+    """Normalize the identifiers of ``raw`` (``{key: raw value}``), dropping empty ones."""
+    country = normalize("country", raw.get("country"))
+    normalized = {}
+    for key in HASHED_KEYS:
+        value = normalize(key, raw.get(key), phone_code=phone_code, country=country)
+        if value:
+            normalized[key] = value
+    return normalized
+
+
+def hash_user_data_batch(rows):
+    """Normalize and hash identifiers for many customers in one pass.
+
+    :param rows: iterable of ``(raw, phone_code)`` pairs, ``raw`` being a
+                 ``{key: raw value}`` dict over :data:`HASHED_KEYS`.
+    :return: list of ``{key: sha256 hex digest}`` dicts, in input order.
+    """
+    normalized = [normalize_user_data(raw, phone_code) for raw, phone_code in rows]
+    flat = [value for data in normalized for value in data.values()]
+    digests = dict(zip(flat, hash_values(flat)))
+    return [{key: digests[value] for key, value in data.items()} for data in normalized]
+
+
+def hash_user_data(raw, phone_code=None):
+    """Single-customer version of :func:`hash_user_data_batch`."""
+    return hash_user_data_batch([(raw, phone_code)])[0]
+
+
+def build_user_data(hashed, **plain):
+    """Assemble a ``user_data`` payload from hashed identifiers and plain values.
+
+    :param hashed: ``{key: digest}`` as returned by :func:`hash_user_data`.
+    :param plain: any of :data:`PLAIN_KEYS` (cookies, IP, user agent), sent unhashed.
+    """
+    user_data = dict(hashed or {})
+    user_data.update({key: value for key, value in plain.items() if key in PLAIN_KEYS and value})
+    return user_data
@@ -11,15 +11,20 @@
         - Automatic WhatsApp notifications on order confirmation
         - Template selection for auto-send
         - Configurable WhatsApp templates with auto-send option
+        - Queued sending: checkout never waits on the WhatsApp provider
     """,
     'author': 'Moahmed Ebrahem',
     'depends': [
         'website_sale',
         'whatsapp',
+        'ih_graph_api',
     ],
     'data': [
+        'security/ir.model.access.csv',
         'views/whatsapp_template_views.xml',
         'data/whatsapp_template_data.xml',
+        'data/ir_cron_data.xml',
+        'data/ir_actions_server_data.xml',
     ],
     'installable': True,
     'application': False,
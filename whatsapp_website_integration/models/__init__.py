@@ -4,3 +4,5 @@ from . import whatsapp_template_button
 from . import sale_order
 from . import payment_transaction
 from . import discuss_channel
+from . import whatsapp_order_tap
+from . import whatsapp_message
@@ -3,6 +3,10 @@ import logging
 from odoo import models
 from odoo.tools import html2plaintext
 
+from odoo.addons.ih_graph_api.tools import metrics
+
+from .whatsapp_template_button import normalize_button_text
+
 _logger = logging.getLogger(__name__)
 
 
@@ -28,16 +32,19 @@ class DiscussChannel(models.Model):
             return new_msg
 
         # Check if this button text is configured to trigger any sale order action
-        action_button = self.env['whatsapp.template.button'].sudo().search([
-            '|',
-            ('trigger_sale_order_confirm', '=', True),
-            ('trigger_sale_order_cancel', '=', True),
-            ('name', '=', button_text),
-        ], limit=1)
-        
-        if not action_button:
+        # (cached map: plain inbound chats cost no query)
+        action = self.env['whatsapp.template.button']._get_tap_actions().get(
+            normalize_button_text(button_text)
+        )
+        if not action:
             return new_msg
 
+        with metrics.measure('whatsapp.button_tap', self.env):
+            self._apply_whatsapp_button_tap(action, button_text)
+        return new_msg
+
+    def _apply_whatsapp_button_tap(self, action, button_text):
+        """Queue the confirmation or cancellation of the sale order this channel was opened from"""
         # Channel must be linked to a document (the message we sent from)
         related_msg = self.whatsapp_mail_message_id
         if not related_msg or related_msg.model != 'sale.order':
@@ -45,52 +52,12 @@ class DiscussChannel(models.Model):
                 "WhatsApp button tap '%s' not applied: channel not linked to sale.order",
                 button_text
             )
-            return new_msg
+            return
 
         order = self.env['sale.order'].sudo().browse(related_msg.res_id)
         if not order.exists():
-            return new_msg
-
-        # Handle CONFIRM action
-        if action_button.trigger_sale_order_confirm:
-            if order.state not in ('draft', 'sent'):
-                _logger.info(
-                    "WhatsApp confirm button tap for order %s ignored: state is %s",
-                    order.name, order.state
-                )
-                return new_msg
-            
-            try:
-                order.action_confirm()
-                _logger.info(
-                    "Sale order %s confirmed via WhatsApp button tap '%s'",
-                    order.name, button_text
-                )
-            except Exception as e:
-                _logger.exception(
-                    "Failed to confirm order %s from WhatsApp button tap: %s",
-                    order.name, e
-                )
-
-        # Handle CANCEL action
-        elif action_button.trigger_sale_order_cancel:
-            if order.state in ('cancel', 'done'):
-                _logger.info(
-                    "WhatsApp cancel button tap for order %s ignored: state is %s",
-                    order.name, order.state
-                )
-                return new_msg
-            
-            try:
-                order.action_cancel()
-                _logger.info(
-                    "Sale order %s cancelled via WhatsApp button tap '%s'",
-                    order.name, button_text
-                )
-            except Exception as e:
-                _logger.exception(
-                    "Failed to cancel order %s from WhatsApp button tap: %s",
-                    order.name, e
-                )
+            return
 
-        return new_msg
\ No newline at end of file
+        # Queued: the confirm cascade (stock, invoicing, Meta events) runs in
+        # the background and the webhook is acknowledged right away
+        self.env['whatsapp.order.tap'].sudo()._record(order, action, button_text)
@@ -2,6 +2,8 @@
 from odoo import models
 import logging
 
+from odoo.addons.ih_graph_api.tools import metrics
+
 _logger = logging.getLogger(__name__)
 
 
@@ -11,33 +13,25 @@ class PaymentTransaction(models.Model):
     def _set_done(self):
         res = super()._set_done()
 
-        for tx in self:
-            _logger.info(
-                "Transaction %s done (provider: %s)",
-                tx.reference, tx.provider_code
+        # ONLY Pay on Site
+        manual_txs = self.filtered(lambda tx: tx.provider_code == 'manual')
+        if not manual_txs:
+            return res
+
+        # Website orders still awaiting payment, in one query whatever the
+        # number of transactions (see sale_order_whatsapp_reminder_index)
+        orders = self.env['sale.order'].search([
+            ('transaction_ids', 'in', manual_txs.ids),
+            ('website_id', '!=', False),
+            ('state', '=', 'sent'),
+            ('invoice_status', '=', 'no'),
+            ('whatsapp_msg_sent', '=', False),
+        ])
+        if orders:
+            metrics.trace(
+                _logger, "Sending Pay-on-Site WhatsApp reminder for order(s) %s",
+                orders.ids
             )
-
-            # ONLY Pay on Site
-            if tx.provider_code != 'manual':
-                continue
-
-            for order in tx.sale_order_ids:
-                _logger.info("Evaluating order %s for WhatsApp", order.name)
-
-                if not order.website_id:
-                    continue
-                if order.state != 'sent':
-                    continue
-                if order.invoice_status != 'no':
-                    continue
-                if order.whatsapp_msg_sent:
-                    continue
-
-                _logger.info(
-                    "Sending Pay-on-Site WhatsApp reminder for order %s",
-                    order.name
-                )
-
-                order._send_order_confirmation_whatsapp()
+            orders._dispatch_order_confirmation_whatsapp()
 
         return res
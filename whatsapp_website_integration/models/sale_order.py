@@ -1,10 +1,34 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields, api, _
-from odoo.exceptions import UserError
+from odoo import models, fields, api, tools, _
+from odoo.exceptions import UserError, ValidationError
+from odoo.tools.sql import create_index
 import logging
+import threading
+from collections import defaultdict
+from datetime import timedelta
+
+from odoo.addons.ih_graph_api.tools import metrics, rate_limit
 
 _logger = logging.getLogger(__name__)
 
+# Orders claimed per transaction by the queued-send cron
+WHATSAPP_CRON_BATCH_SIZE = 50
+# Send attempts before a queued confirmation is marked failed
+WHATSAPP_MAX_ATTEMPTS = 6
+# Backoff between attempts: 1 min, 2 min, 4 min, ... capped at 1 hour
+WHATSAPP_RETRY_BASE_DELAY = 60
+WHATSAPP_RETRY_MAX_DELAY = 3600
+# whatsapp.message failure types worth another attempt
+WHATSAPP_RETRYABLE_FAILURES = ('network', 'whatsapp_recoverable')
+# whatsapp.message states of a message accepted by WhatsApp, and of a failed one
+WHATSAPP_SENT_STATES = ('sent', 'delivered', 'read', 'replied')
+WHATSAPP_FAILED_STATES = ('error', 'bounced', 'cancel')
+# Default budget of the order_summary variable (WhatsApp caps parameter length)
+ORDER_SUMMARY_MAX_LINES = 30
+ORDER_SUMMARY_MAX_CHARS = 1000
+# Phone fields of sale order templates; confirmations use the mobile or else the phone
+PARTNER_PHONE_FIELDS = ('partner_id.mobile', 'partner_id.phone')
+
 
 class SaleOrder(models.Model):
     _inherit = 'sale.order'
@@ -13,8 +37,50 @@ class SaleOrder(models.Model):
         string='WhatsApp Confirmation Sent',
         default=False,
         readonly=True,
+        index=True,
         help='Indicates if WhatsApp confirmation message has been sent'
     )
+    whatsapp_send_state = fields.Selection(
+        [
+            ('pending', 'Pending'),
+            ('queued', 'Queued'),
+            ('sent', 'Sent'),
+            ('failed', 'Failed'),
+        ],
+        string='WhatsApp Send Status',
+        readonly=True,
+        copy=False,
+        index=True,
+        help='Status of the WhatsApp confirmation message. Queued: the message '
+             'is waiting in the WhatsApp queue; the order is marked sent, or '
+             'the send retried, once WhatsApp has processed it.'
+    )
+    whatsapp_message_id = fields.Many2one(
+        'whatsapp.message',
+        string='WhatsApp Confirmation Message',
+        readonly=True,
+        copy=False,
+        index='btree_not_null',
+    )
+    whatsapp_send_attempts = fields.Integer(
+        string='WhatsApp Send Attempts',
+        readonly=True,
+        copy=False,
+    )
+    whatsapp_next_attempt = fields.Datetime(
+        string='WhatsApp Next Attempt',
+        readonly=True,
+        copy=False,
+        help='A queued confirmation that failed temporarily is not retried before this date'
+    )
+
+    def init(self):
+        super().init()
+        # Pay-on-Site reminders: website orders sent but not yet invoiced
+        create_index(
+            self.env.cr, 'sale_order_whatsapp_reminder_index', self._table,
+            ['state', 'invoice_status'], where='website_id IS NOT NULL',
+        )
 
     def _find_value_from_field_path(self, field_path):
         if field_path == 'amount':
@@ -22,22 +88,215 @@ class SaleOrder(models.Model):
         if field_path == 'link':
             return self.get_portal_url()  # or a custom payment URL
         if field_path == 'order_summary':
-            lines = []
-            for line in self.order_line:
-                lines.append(f"- {line.product_id.display_name}: {line.product_uom_qty} x {line.price_unit} {self.currency_id.name}")
-            return "\n".join(lines)
+            return self._get_whatsapp_order_summary()
+        if field_path in PARTNER_PHONE_FIELDS and self.env.context.get('whatsapp_confirmation_phone'):
+            # Confirmations sent in batch go to the mobile, or else the phone,
+            # whichever of the two the template's phone field names
+            return self.partner_id.mobile or self.partner_id.phone
         return super()._find_value_from_field_path(field_path)
 
+    def _get_whatsapp_order_summary(self):
+        """Order lines as rendered in the ``order_summary`` template variable.
+
+        Limited to ``whatsapp_website_integration.summary_max_lines`` lines and
+        ``whatsapp_website_integration.summary_max_chars`` characters (system
+        parameters). Cached per version of the order (``write_date``), so
+        resends and previews do not render it again.
+        """
+        self.ensure_one()
+        ICP = self.env['ir.config_parameter'].sudo()
+        max_lines = int(ICP.get_param('whatsapp_website_integration.summary_max_lines', ORDER_SUMMARY_MAX_LINES))
+        max_chars = int(ICP.get_param('whatsapp_website_integration.summary_max_chars', ORDER_SUMMARY_MAX_CHARS))
+        if not isinstance(self.id, int):
+            return self._render_whatsapp_order_summary(max_lines, max_chars)
+        return self._get_whatsapp_order_summary_cached(
+            self.id, self.write_date, self.env.lang, max_lines, max_chars
+        )
+
+    @api.model
+    @tools.ormcache('order_id', 'write_date', 'lang', 'max_lines', 'max_chars')
+    def _get_whatsapp_order_summary_cached(self, order_id, write_date, lang, max_lines, max_chars):
+        return self.browse(order_id).with_context(lang=lang)._render_whatsapp_order_summary(max_lines, max_chars)
+
+    def _render_whatsapp_order_summary(self, max_lines, max_chars):
+        """Render at most ``max_lines`` lines and ``max_chars`` characters,
+        ending with a "+N more" line when lines are left out"""
+        lines = self.order_line.filtered(lambda l: not l.display_type)
+        shown = lines[:max_lines]
+        # Names of the rendered products only, in a single read
+        names = {p['id']: p['display_name'] for p in shown.product_id.read(['display_name'])}
+        currency = self.currency_id.name
+
+        rendered = []
+        size = -1  # no separator before the first line
+        for line in shown:
+            text = f"- {names.get(line.product_id.id, '')}: {line.product_uom_qty} x {line.price_unit} {currency}"
+            if size + 1 + len(text) > max_chars:
+                break
+            rendered.append(text)
+            size += 1 + len(text)
+
+        # Make room for the tail
+        while rendered and len(rendered) < len(lines):
+            tail = _('+%s more', len(lines) - len(rendered))
+            if size + 1 + len(tail) <= max_chars:
+                break
+            size -= 1 + len(rendered.pop())
+        if len(rendered) < len(lines):
+            rendered.append(_('+%s more', len(lines) - len(rendered)))
+        return "\n".join(rendered)
+
+    # ---------------------------------------------------------
+    # QUEUED DISPATCH
+    # ---------------------------------------------------------
+
+    def _dispatch_order_confirmation_whatsapp(self):
+        """Send or queue the WhatsApp confirmation, depending on the send mode.
+
+        The mode is read from the ``whatsapp_website_integration.send_mode``
+        system parameter: ``queue`` (default) records a pending send that the
+        cron performs in the background, ``sync`` sends right away.
+        """
+        send_mode = self.env['ir.config_parameter'].sudo().get_param(
+            'whatsapp_website_integration.send_mode', 'queue'
+        )
+        if send_mode == 'sync':
+            self._send_order_confirmation_whatsapp_batch(force_send_by_cron=False)
+            return True
+        return self._queue_order_confirmation_whatsapp()
+
+    def _queue_order_confirmation_whatsapp(self):
+        """Record a pending WhatsApp confirmation and wake up the send cron"""
+        orders = self.filtered(
+            lambda o: not o.whatsapp_msg_sent and o.whatsapp_send_state not in ('pending', 'queued')
+        )
+        if not orders:
+            return False
+        orders.sudo().write({
+            'whatsapp_send_state': 'pending',
+            'whatsapp_send_attempts': 0,
+            'whatsapp_next_attempt': False,
+        })
+        metrics.trace(_logger, "WhatsApp confirmation queued for order(s) %s", orders.ids)
+        self.env.ref(
+            'whatsapp_website_integration.ir_cron_send_pending_whatsapp'
+        )._trigger()
+        return True
+
+    def _claim_pending_whatsapp(self, limit):
+        """Lock a batch of pending orders, skipping those held by a concurrent run"""
+        self.env.cr.execute("""
+            SELECT id
+              FROM sale_order
+             WHERE whatsapp_send_state = 'pending'
+               AND (whatsapp_next_attempt IS NULL OR whatsapp_next_attempt <= now() at time zone 'UTC')
+          ORDER BY id
+             LIMIT %s
+               FOR UPDATE SKIP LOCKED
+        """, [limit])
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
+
+    @api.model
+    def _cron_send_pending_whatsapp(self, batch_size=WHATSAPP_CRON_BATCH_SIZE):
+        """Send the queued WhatsApp confirmations, one batch per transaction"""
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        # Messages processed without notifying their order (e.g. deleted)
+        self.search([
+            ('whatsapp_send_state', '=', 'queued'),
+            '|', ('whatsapp_message_id', '=', False), ('whatsapp_message_id.state', '!=', 'outgoing'),
+        ])._whatsapp_apply_message_state()
+        while True:
+            orders = self._claim_pending_whatsapp(batch_size)
+            if not orders:
+                break
+            already_sent = orders.filtered('whatsapp_msg_sent')
+            already_sent.write({'whatsapp_send_state': 'sent'})
+            (orders - already_sent)._send_order_confirmation_whatsapp_batch(force_send_by_cron=False)
+            if not auto_commit:
+                break
+            self.env.cr.commit()
+
+    def _whatsapp_apply_message_state(self):
+        """Settle the queued confirmations whose WhatsApp message was processed.
+
+        Orders whose message was accepted by WhatsApp are marked sent; those
+        whose message failed are retried or failed (see
+        :meth:`_whatsapp_send_failed`). Orders whose message is still in the
+        WhatsApp queue stay queued.
+        """
+        sent = self.browse()
+        failures = {}
+        log_entries = []
+        for order in self.filtered(lambda o: o.whatsapp_send_state == 'queued'):
+            message = order.whatsapp_message_id
+            if message.state in WHATSAPP_SENT_STATES:
+                sent |= order
+                log_entries.append(order._whatsapp_log_entry(
+                    message.wa_template_id, message.mobile_number, True, message.state
+                ))
+            elif message.state in WHATSAPP_FAILED_STATES or not message:
+                error = message.failure_reason or message.failure_type or message.state or 'message deleted'
+                retryable = message.state == 'error' and message.failure_type in WHATSAPP_RETRYABLE_FAILURES
+                failures[order.id] = (error, retryable, 0)
+                log_entries.append(order._whatsapp_log_entry(
+                    message.wa_template_id, message.mobile_number, False, error
+                ))
+        sent.write({
+            'whatsapp_msg_sent': True,
+            'whatsapp_send_state': 'sent',
+            'whatsapp_next_attempt': False,
+        })
+        self.browse(list(failures))._whatsapp_send_failed(failures)
+        self.env['graph.api.event.log'].sudo()._log(log_entries)
+
+    def _whatsapp_send_failed(self, failures):
+        """Reschedule the confirmations that failed temporarily, with backoff.
+
+        Orders failing for good (no template or phone, rejected by the
+        composer or by Meta), or out of attempts, are marked failed.
+        Rescheduled orders are sent again by the queued-send cron.
+
+        :param failures: ``{order id: (error, retryable, retry_after)}``
+        """
+        by_values = defaultdict(list)
+        for order in self:
+            _error, retryable, retry_after = failures.get(order.id, (None, False, 0))
+            attempts = order.whatsapp_send_attempts + 1
+            retry = retryable and attempts < WHATSAPP_MAX_ATTEMPTS
+            by_values[(attempts, retry, retry_after)].append(order.id)
+        now = fields.Datetime.now()
+        for (attempts, retry, retry_after), ids in by_values.items():
+            delay = rate_limit.backoff_delay(
+                attempts - 1, base=WHATSAPP_RETRY_BASE_DELAY, cap=WHATSAPP_RETRY_MAX_DELAY,
+                retry_after=retry_after,
+            )
+            self.browse(ids).write({
+                'whatsapp_send_attempts': attempts,
+                'whatsapp_send_state': 'pending' if retry else 'failed',
+                'whatsapp_next_attempt': now + timedelta(seconds=delay) if retry else False,
+            })
+            if retry:
+                self.env.ref('whatsapp_website_integration.ir_cron_send_pending_whatsapp')._trigger(
+                    now + timedelta(seconds=delay)
+                )
+            else:
+                _logger.warning(
+                    "WhatsApp confirmation of order(s) %s failed after %s attempt(s)", ids, attempts
+                )
+
     # ---------------------------------------------------------
     # CORE WHATSAPP SEND LOGIC
     # ---------------------------------------------------------
 
-    def _send_order_confirmation_whatsapp(self):
-        """Send WhatsApp confirmation message for the order"""
+    def _send_order_confirmation_whatsapp(self, template=None):
+        """Send WhatsApp confirmation message for the order
+
+        :param template: template to send, resolved for the order if not given
+        """
         self.ensure_one()
-        _logger.info("Starting WhatsApp send for order %s", self.name)
+        metrics.trace(_logger, "Starting WhatsApp send for order %s", self.name)
 
-        template = self.env['whatsapp.template'].get_order_confirmation_template()
+        template = template or self.env['whatsapp.template'].get_order_confirmation_template(self)
         if not template:
             _logger.warning(
                 "No WhatsApp template configured for auto-send (order %s)",
@@ -59,41 +318,177 @@ class SaleOrder(models.Model):
 
         return self._send_via_standard_whatsapp(template, phone)
 
-    def _send_via_standard_whatsapp(self, template, phone):
-        """Send message using standard Odoo WhatsApp"""
-        _logger.info(
-            "Preparing standard WhatsApp composer for order %s (phone: %s)",
-            self.name, phone
+    def _send_order_confirmation_whatsapp_batch(self, force_send_by_cron=True):
+        """Send WhatsApp confirmations for all orders in ``self`` at once.
+
+        Orders are grouped by (website, customer language, company): the
+        auto-send template of each group is resolved once, and one composer
+        creates the messages of the whole group (a single ``create`` of its
+        mail and WhatsApp messages). Customer phones are fetched in a single
+        query; orders already sent, or whose message is queued, are skipped.
+
+        Only a single message sent without ``force_send_by_cron`` is posted
+        right away; the others are left to the WhatsApp queue cron. Each order
+        is linked to its message and marked queued until the message is
+        processed (see :meth:`_whatsapp_apply_message_state`): it is then
+        marked sent, or failed / rescheduled like any failed send.
+
+        :return: the orders whose message was created (sent or queued)
+        """
+        orders = self.filtered(lambda o: not o.whatsapp_msg_sent and o.whatsapp_send_state != 'queued')
+        if not orders:
+            return self.browse()
+
+        if 'whatsapp.composer' not in self.env:
+            _logger.error("Odoo WhatsApp module is not installed")
+            return self.browse()
+
+        orders.partner_id.fetch(['name', 'mobile', 'phone', 'lang'])
+        # {order id: (error, retryable, retry_after)}
+        failures = {}
+        groups = defaultdict(list)
+        for order in orders:
+            if not (order.partner_id.mobile or order.partner_id.phone):
+                _logger.warning(
+                    "Customer %s has no phone number (order %s)",
+                    order.partner_id.name, order.name
+                )
+                failures[order.id] = ('Customer has no phone number', False, 0)
+                continue
+            key = (order.website_id.id, order.partner_id.lang or '', order.company_id.id)
+            groups[key].append(order.id)
+
+        Template = self.env['whatsapp.template']
+        messages = self.env['whatsapp.message']
+        log_entries = []
+        for order_ids in groups.values():
+            group = self.browse(order_ids)
+            # Same (website, lang, company) key: one resolution for the group
+            template = Template.get_order_confirmation_template(group[0])
+            if not template:
+                _logger.warning(
+                    "No WhatsApp template configured for auto-send (order(s) %s)",
+                    group.mapped('name')
+                )
+                failures.update(dict.fromkeys(group.ids, ('No WhatsApp template configured', False, 0)))
+                continue
+            messages |= group._send_whatsapp_confirmation_group(template, force_send_by_cron, log_entries, failures)
+        self.env['graph.api.event.log'].sudo()._log(log_entries)
+
+        handed = self.browse()
+        for message in messages:
+            order = self.browse(message.mail_message_id.res_id)
+            if order not in orders:
+                continue
+            order.write({'whatsapp_message_id': message.id, 'whatsapp_send_state': 'queued'})
+            handed |= order
+        handed._whatsapp_apply_message_state()
+        self.browse(list(failures))._whatsapp_send_failed(failures)
+        metrics.trace(
+            _logger, "WhatsApp confirmation sent or queued for %s of %s order(s)",
+            len(handed), len(self)
         )
+        return handed
 
+    def _send_whatsapp_confirmation_group(self, template, force_send_by_cron, log_entries, failures):
+        """Send ``template`` to the orders in ``self`` with a single composer.
+
+        With several orders, the composer is in batch mode: each message goes
+        to the number its order yields for the template's phone field (see
+        :meth:`_find_value_from_field_path`), and the composer's ``phone`` is
+        left empty. If the composer rejects the group, its orders are sent one
+        by one, so that one faulty order does not hold back the others.
+
+        :param log_entries: list the ``graph.api.event.log`` entries of the
+                            failed orders are appended to
+        :param failures: dict the failed orders are added to, as ``{order id:
+                         (error, retryable, retry_after)}``
+        :return: the ``whatsapp.message`` records created
+        """
+        Message = self.env['whatsapp.message'].sudo()
+        last_message_id = Message.search([], order='id desc', limit=1).id
         try:
-            composer = self.env['whatsapp.composer'].with_context(
-                active_model='sale.order',
-                active_id=self.id,
-                active_ids=[self.id],
-            ).sudo().create({
-                'res_model': 'sale.order',
-                'wa_template_id': template.id,
-                'phone': phone,
-            })
+            with self.env.cr.savepoint():
+                with metrics.measure('whatsapp.composer_create', self.env):
+                    composer = self.env['whatsapp.composer'].sudo().with_context(
+                        active_model='sale.order',
+                        active_id=self.ids[0],
+                        active_ids=self.ids,
+                        whatsapp_confirmation_phone=True,
+                    ).create({
+                        'res_model': 'sale.order',
+                        'wa_template_id': template.id,
+                        'phone': len(self) == 1 and (self.partner_id.mobile or self.partner_id.phone),
+                    })
+                with metrics.measure('whatsapp.send', self.env):
+                    messages = composer._send_whatsapp_template(force_send_by_cron=force_send_by_cron)
+        except Exception as e:
+            if len(self) > 1:
+                _logger.warning(
+                    "WhatsApp send failed for %s orders at once, retrying one by one: %s",
+                    len(self), e
+                )
+                messages = self.env['whatsapp.message']
+                for order in self:
+                    messages |= order._send_whatsapp_confirmation_group(
+                        template, force_send_by_cron, log_entries, failures
+                    )
+                return messages
+            _logger.error("WhatsApp send failed for order %s: %s", self.name, e)
+            log_entries.append(self._whatsapp_log_entry(
+                template, self.partner_id.mobile or self.partner_id.phone, False, str(e)
+            ))
+            # Rendering / validation errors fail again; anything else may not
+            failures[self.id] = (
+                str(e), not isinstance(e, (UserError, ValidationError)), getattr(e, 'retry_after', 0)
+            )
+            return self.env['whatsapp.message']
+        if not (isinstance(messages, models.BaseModel) and messages._name == 'whatsapp.message'):
+            messages = Message.search([
+                ('id', '>', last_message_id),
+                ('wa_template_id', '=', template.id),
+                ('mail_message_id.model', '=', 'sale.order'),
+                ('mail_message_id.res_id', 'in', self.ids),
+            ])
+        return messages
 
-            _logger.info(
-                "WhatsApp composer created (ID: %s) for order %s",
+    def _send_via_standard_whatsapp(self, template, phone):
+        """Send message using standard Odoo WhatsApp"""
+        try:
+            with metrics.measure('whatsapp.composer_create', self.env):
+                composer = self.env['whatsapp.composer'].with_context(
+                    active_model='sale.order',
+                    active_id=self.id,
+                    active_ids=[self.id],
+                ).sudo().create({
+                    'res_model': 'sale.order',
+                    'wa_template_id': template.id,
+                    'phone': phone,
+                })
+
+            metrics.trace(
+                _logger, "WhatsApp composer created (ID: %s) for order %s",
                 composer.id, self.name
             )
 
             try:
-                composer.action_send_whatsapp_template()
+                with metrics.measure('whatsapp.send', self.env):
+                    composer.action_send_whatsapp_template()
             except UserError as ue:
                 _logger.error(
                     "WhatsApp template rendering error for order %s: %s",
                     self.name, ue
                 )
+                self._log_whatsapp_send(template, phone, False, str(ue))
                 return False
 
-            self.whatsapp_msg_sent = True
-            _logger.info(
-                "WhatsApp confirmation successfully sent for order %s",
+            self.write({
+                'whatsapp_msg_sent': True,
+                'whatsapp_send_state': 'sent',
+            })
+            self._log_whatsapp_send(template, phone, True, 'sent')
+            metrics.trace(
+                _logger, "WhatsApp confirmation successfully sent for order %s",
                 self.name
             )
             return True
@@ -105,8 +500,32 @@ class SaleOrder(models.Model):
             )
             import traceback
             _logger.error(traceback.format_exc())
+            self._log_whatsapp_send(template, phone, False, str(e))
             return False
 
+    def _whatsapp_log_entry(self, template, phone, ok, response):
+        """``graph.api.event.log`` entry of the confirmation sent for this order"""
+        self.ensure_one()
+        return {
+            'channel': 'whatsapp',
+            'res_model': 'sale.order',
+            'res_id': self.id,
+            'destination': phone,
+            'ok': ok,
+            'payload': {
+                'template_id': template.id,
+                'template': template.template_name,
+                'lang': template.lang_code,
+                'phone': phone,
+            },
+            'response': response,
+        }
+
+    def _log_whatsapp_send(self, template, phone, ok, response):
+        self.env['graph.api.event.log'].sudo()._log(
+            [self._whatsapp_log_entry(template, phone, ok, response)]
+        )
+
     # ---------------------------------------------------------
     # MANUAL ACTION
     # ---------------------------------------------------------
@@ -116,7 +535,7 @@ class SaleOrder(models.Model):
         self.ensure_one()
         _logger.info("Manual WhatsApp send triggered for order %s", self.name)
 
-        template = self.env['whatsapp.template'].get_order_confirmation_template()
+        template = self.env['whatsapp.template'].get_order_confirmation_template(self)
         if not template:
             _logger.warning(
                 "Manual send blocked: no template configured (order %s)",
@@ -136,7 +555,7 @@ class SaleOrder(models.Model):
                 'Customer %s has no phone number.'
             ) % self.partner_id.name)
 
-        result = self._send_order_confirmation_whatsapp()
+        result = self._send_order_confirmation_whatsapp(template=template)
 
         if result:
             _logger.info(
@@ -169,44 +588,49 @@ class SaleOrder(models.Model):
             }
         }
 
+    def action_send_whatsapp_bulk(self):
+        """List view action: send WhatsApp confirmations for the selected orders"""
+        already_sent = self.filtered(lambda o: o.whatsapp_msg_sent or o.whatsapp_send_state == 'queued')
+        handed = (self - already_sent)._send_order_confirmation_whatsapp_batch()
+        sent = handed.filtered('whatsapp_msg_sent')
+        failed = len(self) - len(already_sent) - len(handed)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('WhatsApp Confirmations'),
+                'message': _(
+                    '%(sent)s sent, %(queued)s queued, %(skipped)s already sent or queued, %(failed)s failed.',
+                    sent=len(sent), queued=len(handed - sent), skipped=len(already_sent), failed=failed,
+                ),
+                'type': 'warning' if failed else 'success',
+                'sticky': False,
+            }
+        }
+
     # ---------------------------------------------------------
     # OVERRIDES
     # ---------------------------------------------------------
 
     def action_quotation_sent(self):
         """Override to send WhatsApp message on order confirmation"""
-        _logger.info("Confirming sale order(s): %s", self.ids)
         res = super().action_quotation_send()
 
-        for order in self:
-            if order.website_id and not order.whatsapp_msg_sent:
-                _logger.info(
-                    "Auto-sending WhatsApp for website order %s",
-                    order.name
-                )
-                order._send_order_confirmation_whatsapp()
+        orders = self.filtered(lambda o: o.website_id and not o.whatsapp_msg_sent)
+        if orders:
+            metrics.trace(
+                _logger, "Auto-sending WhatsApp for website order(s) %s",
+                orders.ids
+            )
+            orders._dispatch_order_confirmation_whatsapp()
 
         return res
 
-    def _cart_update_order_line(self, product_id, quantity, order_line_id, **kwargs):
-        """Override to handle website cart updates"""
-        _logger.debug(
-            "Cart update on order %s (product_id=%s, qty=%s)",
-            self.id, product_id, quantity
-        )
-        return super()._cart_update_order_line(
-            product_id, quantity, order_line_id, **kwargs
-        )
-
     def _create_payment_transaction(self, vals):
         """Override to hook into payment creation"""
-        _logger.info(
-            "Creating payment transaction for order %s",
-            self.name
-        )
         transaction = super()._create_payment_transaction(vals)
-        _logger.info(
-            "Payment transaction %s created for order %s",
+        metrics.trace(
+            _logger, "Payment transaction %s created for order %s",
             transaction.id if transaction else None,
             self.name
         )
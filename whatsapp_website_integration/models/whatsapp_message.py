@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+from odoo import models
+
+
+class WhatsAppMessage(models.Model):
+    _inherit = 'whatsapp.message'
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'state' in vals:
+            # Settle the order confirmations waiting for these messages
+            self.env['sale.order'].sudo().search([
+                ('whatsapp_message_id', 'in', self.ids),
+                ('whatsapp_send_state', '=', 'queued'),
+            ])._whatsapp_apply_message_state()
+        return res
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+from datetime import timedelta
+
+from odoo import models, fields, api
+
+from odoo.addons.ih_graph_api.tools import metrics
+
+_logger = logging.getLogger(__name__)
+
+# Intents claimed per transaction by the apply cron
+TAP_CRON_BATCH_SIZE = 20
+# Applied intents are kept this long, for support
+TAP_RETENTION_DAYS = 30
+
+
+class WhatsAppOrderTap(models.Model):
+    """Confirm / cancel request made by a customer tapping a template button.
+
+    The webhook only records the intent; the cron applies it with the sale
+    order row locked, so double taps and webhook retries never run the
+    confirm cascade twice, nor concurrently, for the same order.
+    """
+    _name = 'whatsapp.order.tap'
+    _description = 'WhatsApp Order Button Tap'
+    _order = 'id desc'
+
+    order_id = fields.Many2one(
+        'sale.order', string='Sale Order', required=True, index=True, ondelete='cascade'
+    )
+    action = fields.Selection(
+        [('confirm', 'Confirm Order'), ('cancel', 'Cancel Order')],
+        required=True
+    )
+    button_text = fields.Char()
+    state = fields.Selection(
+        [
+            ('pending', 'Pending'),
+            ('done', 'Done'),
+            ('ignored', 'Ignored'),
+            ('failed', 'Failed'),
+        ],
+        default='pending',
+        required=True,
+        index=True
+    )
+    note = fields.Char(help='Why the tap was ignored, or the error it failed with')
+
+    @api.model
+    def _record(self, order, action, button_text):
+        """Queue ``action`` on ``order`` and wake up the apply cron.
+
+        A tap repeating the pending intent of the order is dropped.
+        """
+        if self.search_count([
+            ('order_id', '=', order.id),
+            ('action', '=', action),
+            ('state', '=', 'pending'),
+        ], limit=1):
+            metrics.trace(_logger, "Duplicate WhatsApp %s tap for order %s dropped", action, order.id)
+            return self
+        tap = self.create({'order_id': order.id, 'action': action, 'button_text': button_text})
+        self.env.ref('whatsapp_website_integration.ir_cron_apply_whatsapp_taps')._trigger()
+        return tap
+
+    def _claim_pending(self, limit):
+        """Lock a batch of pending intents and their orders.
+
+        Intents whose order is locked (by a concurrent run, or a user editing
+        it) are skipped and picked up by a later run. ``NO KEY UPDATE`` lets
+        the webhook keep inserting intents for the locked orders meanwhile.
+        """
+        self.env.cr.execute("""
+            SELECT t.id
+              FROM whatsapp_order_tap t
+              JOIN sale_order o ON o.id = t.order_id
+             WHERE t.state = 'pending'
+          ORDER BY t.id
+             LIMIT %s
+               FOR NO KEY UPDATE OF t, o SKIP LOCKED
+        """, [limit])
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
+
+    @api.model
+    def _cron_apply_pending(self, batch_size=TAP_CRON_BATCH_SIZE):
+        """Apply the queued taps, one batch per transaction"""
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        while True:
+            taps = self._claim_pending(batch_size)
+            if not taps:
+                break
+            # Only the last tap on an order counts; earlier ones are duplicates
+            latest = {}
+            for tap in taps.sorted('id'):
+                if tap.order_id in latest:
+                    latest[tap.order_id].write({'state': 'ignored', 'note': 'Superseded by a later tap'})
+                latest[tap.order_id] = tap
+            for tap in latest.values():
+                with metrics.measure('whatsapp.button_tap_apply', self.env):
+                    tap._apply()
+            if not auto_commit:
+                break
+            self.env.cr.commit()
+
+    def _apply(self):
+        self.ensure_one()
+        order = self.order_id.sudo()
+        if self.action == 'confirm':
+            applicable = order.state in ('draft', 'sent')
+        else:
+            applicable = order.state not in ('cancel', 'done')
+        if not applicable:
+            metrics.trace(
+                _logger, "WhatsApp %s button tap for order %s ignored: state is %s",
+                self.action, order.name, order.state
+            )
+            self.write({'state': 'ignored', 'note': f'Order state is {order.state}'})
+            return
+
+        try:
+            with self.env.cr.savepoint():
+                if self.action == 'confirm':
+                    order.action_confirm()
+                else:
+                    order.action_cancel()
+        except Exception as e:
+            _logger.exception(
+                "Failed to %s order %s from WhatsApp button tap: %s",
+                self.action, order.name, e
+            )
+            self.write({'state': 'failed', 'note': str(e)})
+            return
+        metrics.trace(
+            _logger, "Sale order %s: %s applied from WhatsApp button tap '%s'",
+            order.name, self.action, self.button_text
+        )
+        self.state = 'done'
+
+    @api.autovacuum
+    def _gc_applied_taps(self):
+        limit = fields.Datetime.now() - timedelta(days=TAP_RETENTION_DAYS)
+        self.search([('state', '!=', 'pending'), ('create_date', '<', limit)]).unlink()
@@ -1,21 +1,95 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
+
+from odoo.addons.ih_graph_api.tools import metrics
+
+# Template fields the auto-send resolution depends on
+RESOLUTION_FIELDS = {
+    'auto_send_on_order', 'status', 'active', 'lang_code',
+    'auto_send_website_id', 'wa_account_id', 'sequence',
+}
 
 
 class WhatsAppTemplate(models.Model):
     _inherit = 'whatsapp.template'
-    
+
     auto_send_on_order = fields.Boolean(
         string='Auto Send on Website Order',
         default=False,
         help='If checked, this template will be automatically sent when a customer places an order on the website'
     )
-    
+    auto_send_website_id = fields.Many2one(
+        'website',
+        string='Auto Send Website',
+        help='Only auto-send this template for orders of this website. '
+             'Leave empty to use it for every website.'
+    )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        templates = super().create(vals_list)
+        if any(t.auto_send_on_order for t in templates):
+            self.env.registry.clear_cache()
+        return templates
+
+    def write(self, vals):
+        # Also covers status updates synced from Meta (sync button, webhooks)
+        res = super().write(vals)
+        if RESOLUTION_FIELDS & set(vals):
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    @api.model
+    def get_order_confirmation_template(self, order=None):
+        """Get the approved auto-send template best suited to ``order``.
+
+        Without an order, the template for the current company is returned.
+        """
+        if order:
+            website_id = order.website_id.id
+            lang = order.partner_id.lang or ''
+            company_id = order.company_id.id
+        else:
+            website_id, lang, company_id = False, self.env.lang or '', self.env.company.id
+        with metrics.measure('whatsapp.template_lookup', self.env):
+            template_id = self._resolve_order_confirmation_template(website_id, lang, company_id)
+        return self.browse(template_id)
+
     @api.model
-    def get_order_confirmation_template(self):
-        """Get the template marked for auto-send on orders"""
-        template = self.search([
+    @tools.ormcache('website_id', 'lang', 'company_id')
+    def _resolve_order_confirmation_template(self, website_id, lang, company_id):
+        """Id of the best approved auto-send template, or False.
+
+        Templates of another website, or of a WhatsApp account not allowed
+        for ``company_id``, are excluded. Preference order: website-specific
+        over generic, then the customer's exact language, then the same
+        language in another variant (``es`` for ``es_AR``), then any
+        language; ties are broken by sequence.
+        """
+        templates = self.sudo().search([
             ('auto_send_on_order', '=', True),
-            ('status', '=', 'approved')
-        ], limit=1)
-        return template
+            ('status', '=', 'approved'),
+            ('auto_send_website_id', 'in', [website_id, False]),
+        ])
+        lang_prefix = lang.split('_')[0]
+        best_id, best_score = False, None
+        for template in templates:
+            companies = template.wa_account_id.allowed_company_ids
+            if companies and company_id not in companies.ids:
+                continue
+            template_lang = template.lang_code or ''
+            score = (
+                bool(website_id) and template.auto_send_website_id.id == website_id,
+                template_lang == lang,
+                template_lang.split('_')[0] == lang_prefix,
+                -template.sequence,
+                -template.id,
+            )
+            if best_score is None or score > best_score:
+                best_id, best_score = template.id, score
+        return best_id
@@ -1,14 +1,22 @@
 # -*- coding: utf-8 -*-
-from odoo import api, fields, models
+from odoo import api, fields, models, tools
 from odoo.exceptions import ValidationError
 
 
+def normalize_button_text(text):
+    """Normalize a button label / inbound text for tap matching"""
+    return ' '.join((text or '').split()).casefold()
+
+
 class WhatsAppTemplateButton(models.Model):
     _inherit = 'whatsapp.template.button'
 
+    name = fields.Char(index=True)
+
     trigger_sale_order_confirm = fields.Boolean(
         string='Confirm Order on Tap',
         default=False,
+        index=True,
         help='When the customer taps this Quick Reply button, the linked website sale order '
              'will be confirmed (action_confirm). Only use with Quick Reply buttons on '
              'order confirmation templates.'
@@ -17,11 +25,54 @@ class WhatsAppTemplateButton(models.Model):
     trigger_sale_order_cancel = fields.Boolean(
         string='Cancel Order on Tap',
         default=False,
+        index=True,
         help='When the customer taps this Quick Reply button, the linked website sale order '
              'will be cancelled (action_cancel). Only use with Quick Reply buttons on '
              'order confirmation templates.'
     )
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        buttons = super().create(vals_list)
+        if any(b.trigger_sale_order_confirm or b.trigger_sale_order_cancel for b in buttons):
+            self.env.registry.clear_cache()
+        return buttons
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {'name', 'trigger_sale_order_confirm', 'trigger_sale_order_cancel'} & set(vals):
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    @api.model
+    @tools.ormcache()
+    def _get_tap_actions(self):
+        """Map normalized button text to the order action it triggers.
+
+        :return: frozendict ``{text: 'confirm' | 'cancel'}``; when several
+                 buttons share a text, the first one (in button order) wins.
+        """
+        buttons = self.sudo().search_read(
+            [
+                '|',
+                ('trigger_sale_order_confirm', '=', True),
+                ('trigger_sale_order_cancel', '=', True),
+            ],
+            ['name', 'trigger_sale_order_confirm'],
+        )
+        actions = {}
+        for button in buttons:
+            actions.setdefault(
+                normalize_button_text(button['name']),
+                'confirm' if button['trigger_sale_order_confirm'] else 'cancel',
+            )
+        return tools.frozendict(actions)
+
     @api.constrains('trigger_sale_order_confirm', 'trigger_sale_order_cancel', 'button_type')
     def _check_trigger_actions_quick_reply(self):
         for btn in self:
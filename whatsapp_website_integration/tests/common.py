@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase
+
+
+class WhatsAppOrderCase(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.website = cls.env['website'].search([('company_id', '=', cls.env.company.id)], limit=1)
+        cls.account = cls.env['whatsapp.account'].create({
+            'name': 'Test Account',
+            'app_uid': 'test_app',
+            'app_secret': 'test_secret',
+            'account_uid': 'test_account',
+            'phone_uid': '1234567890',
+            'token': 'test_token',
+        })
+        cls.template = cls.env['whatsapp.template'].create({
+            'name': 'Order Confirmation',
+            'body': 'Your order is confirmed',
+            'model_id': cls.env['ir.model']._get_id('sale.order'),
+            'phone_field': 'partner_id.mobile',
+            'status': 'approved',
+            'wa_account_id': cls.account.id,
+            'auto_send_on_order': True,
+        })
+        cls.product = cls.env['product.product'].create({'name': 'Test Product', 'list_price': 10.0})
+
+    def _create_order(self, mobile='+32456001122', phone=False):
+        partner = self.env['res.partner'].create({
+            'name': f'Customer {mobile or phone}',
+            'mobile': mobile,
+            'phone': phone,
+        })
+        return self.env['sale.order'].create({
+            'partner_id': partner.id,
+            'website_id': self.website.id,
+            'order_line': [(0, 0, {'product_id': self.product.id, 'product_uom_qty': 1})],
+        })
+
+    @contextmanager
+    def mock_whatsapp_send(self, state='sent', failure_type=False):
+        """Messages posted during the block end in ``state`` (no HTTP call).
+
+        :return: list the posted messages are appended to
+        """
+        posted = []
+
+        def _send_message(messages, with_commit=False):
+            posted.extend(messages)
+            vals = {'state': state}
+            if state == 'error':
+                vals.update(failure_type=failure_type, failure_reason=f'Simulated {failure_type} error')
+            messages.write(vals)
+
+        Message = type(self.env['whatsapp.message'])
+        with patch.object(Message, '_send_message', autospec=True, side_effect=_send_message):
+            yield posted
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from odoo.tests import tagged
+
+from .common import WhatsAppOrderCase
+
+
+@tagged('post_install', '-at_install')
+class TestWhatsAppBatch(WhatsAppOrderCase):
+
+    def test_mixed_group(self):
+        """One composer for the group, each message to its own customer"""
+        mobile_order = self._create_order(mobile='+32456001122')
+        phone_order = self._create_order(mobile=False, phone='+32456003344')
+        other_order = self._create_order(mobile='+32456005566')
+        orders = mobile_order | phone_order | other_order
+
+        with self.mock_whatsapp_send() as posted:
+            handed = orders._send_order_confirmation_whatsapp_batch(force_send_by_cron=False)
+
+        # More than one message: left to the WhatsApp queue, outcome unknown yet
+        self.assertFalse(posted)
+        self.assertEqual(handed, orders)
+        self.assertEqual(set(orders.mapped('whatsapp_send_state')), {'queued'})
+        self.assertFalse(any(orders.mapped('whatsapp_msg_sent')))
+
+        messages = orders.whatsapp_message_id
+        self.assertEqual(len(messages), 3)
+        for order in orders:
+            message = order.whatsapp_message_id
+            self.assertEqual(message.mail_message_id.res_id, order.id)
+            self.assertEqual(message.mobile_number, order.partner_id.mobile or order.partner_id.phone)
+
+        # Each order follows the outcome of its own message
+        mobile_order.whatsapp_message_id.write({'state': 'sent'})
+        phone_order.whatsapp_message_id.write({'state': 'error', 'failure_type': 'network'})
+        other_order.whatsapp_message_id.write({'state': 'error', 'failure_type': 'whatsapp_unrecoverable'})
+        self.assertEqual(mobile_order.whatsapp_send_state, 'sent')
+        self.assertTrue(mobile_order.whatsapp_msg_sent)
+        self.assertEqual(phone_order.whatsapp_send_state, 'pending')
+        self.assertEqual(phone_order.whatsapp_send_attempts, 1)
+        self.assertEqual(other_order.whatsapp_send_state, 'failed')
+
+    def test_single_order_is_sent_at_once(self):
+        order = self._create_order()
+        with self.mock_whatsapp_send() as posted:
+            handed = order._send_order_confirmation_whatsapp_batch(force_send_by_cron=False)
+        self.assertEqual(handed, order)
+        self.assertEqual(len(posted), 1)
+        self.assertEqual(order.whatsapp_send_state, 'sent')
+
+    def test_bulk_action_skips_queued_orders(self):
+        first, second = self._create_order(), self._create_order(mobile='+32456007788')
+        (first | second).action_send_whatsapp_bulk()
+        self.assertEqual(set((first | second).mapped('whatsapp_send_state')), {'queued'})
+        messages = (first | second).whatsapp_message_id
+        (first | second).action_send_whatsapp_bulk()
+        self.assertEqual((first | second).whatsapp_message_id, messages)
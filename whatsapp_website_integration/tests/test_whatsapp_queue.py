@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+from odoo import fields
+from odoo.tests import tagged
+
+from odoo.addons.whatsapp_website_integration.models.sale_order import WHATSAPP_MAX_ATTEMPTS
+
+from .common import WhatsAppOrderCase
+
+
+@tagged('post_install', '-at_install')
+class TestWhatsAppQueue(WhatsAppOrderCase):
+
+    def _queue_and_run(self, order, **send):
+        order._queue_order_confirmation_whatsapp()
+        with self.mock_whatsapp_send(**send) as posted:
+            self.env['sale.order']._cron_send_pending_whatsapp()
+        return posted
+
+    def test_queue(self):
+        order = self._create_order()
+        self.assertTrue(order._queue_order_confirmation_whatsapp())
+        self.assertEqual(order.whatsapp_send_state, 'pending')
+        self.assertEqual(order.whatsapp_send_attempts, 0)
+        # Queuing again is a no-op
+        self.assertFalse(order._queue_order_confirmation_whatsapp())
+
+    def test_sent(self):
+        order = self._create_order()
+        posted = self._queue_and_run(order)
+        self.assertEqual(len(posted), 1)
+        self.assertEqual(order.whatsapp_message_id, posted[0])
+        self.assertEqual(order.whatsapp_send_state, 'sent')
+        self.assertTrue(order.whatsapp_msg_sent)
+
+    def test_transient_error_is_retried(self):
+        order = self._create_order()
+        before = fields.Datetime.now()
+        self._queue_and_run(order, state='error', failure_type='network')
+        self.assertEqual(order.whatsapp_send_state, 'pending')
+        self.assertEqual(order.whatsapp_send_attempts, 1)
+        self.assertGreater(order.whatsapp_next_attempt, before)
+        self.assertFalse(order.whatsapp_msg_sent)
+
+        # Not claimed again before its next attempt
+        with self.mock_whatsapp_send() as posted:
+            self.env['sale.order']._cron_send_pending_whatsapp()
+        self.assertFalse(posted)
+        self.assertEqual(order.whatsapp_send_attempts, 1)
+
+        # Due: sent again, with a new message
+        order.whatsapp_next_attempt = before
+        first_message = order.whatsapp_message_id
+        with self.mock_whatsapp_send() as posted:
+            self.env['sale.order']._cron_send_pending_whatsapp()
+        self.assertEqual(len(posted), 1)
+        self.assertNotEqual(order.whatsapp_message_id, first_message)
+        self.assertEqual(order.whatsapp_send_state, 'sent')
+
+    def test_attempts_exhausted(self):
+        order = self._create_order()
+        self._queue_and_run(order, state='error', failure_type='network')
+        order.write({
+            'whatsapp_send_attempts': WHATSAPP_MAX_ATTEMPTS - 1,
+            'whatsapp_next_attempt': False,
+        })
+        with self.mock_whatsapp_send(state='error', failure_type='network'):
+            self.env['sale.order']._cron_send_pending_whatsapp()
+        self.assertEqual(order.whatsapp_send_state, 'failed')
+        self.assertEqual(order.whatsapp_send_attempts, WHATSAPP_MAX_ATTEMPTS)
+        self.assertFalse(order.whatsapp_next_attempt)
+
+    def test_permanent_error_fails_at_once(self):
+        order = self._create_order()
+        self._queue_and_run(order, state='error', failure_type='whatsapp_unrecoverable')
+        self.assertEqual(order.whatsapp_send_state, 'failed')
+        self.assertEqual(order.whatsapp_send_attempts, 1)
+
+    def test_no_phone_fails_at_once(self):
+        order = self._create_order(mobile=False)
+        posted = self._queue_and_run(order)
+        self.assertFalse(posted)
+        self.assertEqual(order.whatsapp_send_state, 'failed')
+
+    def test_queued_message_settles_later(self):
+        order = self._create_order()
+        # force_send_by_cron: the message is left to the WhatsApp queue
+        with self.mock_whatsapp_send() as posted:
+            handed = order._send_order_confirmation_whatsapp_batch(force_send_by_cron=True)
+        self.assertEqual(handed, order)
+        self.assertFalse(posted)
+        self.assertEqual(order.whatsapp_send_state, 'queued')
+        self.assertFalse(order.whatsapp_msg_sent)
+        self.assertEqual(order.whatsapp_message_id.state, 'outgoing')
+
+        # Neither queued again nor resent while waiting
+        self.assertFalse(order._queue_order_confirmation_whatsapp())
+        self.assertFalse(order._send_order_confirmation_whatsapp_batch())
+
+        order.whatsapp_message_id.write({'state': 'error', 'failure_type': 'network'})
+        self.assertEqual(order.whatsapp_send_state, 'pending')
+        self.assertEqual(order.whatsapp_send_attempts, 1)
+
+    def test_cron_settles_orphan_queued_orders(self):
+        order = self._create_order()
+        order._send_order_confirmation_whatsapp_batch(force_send_by_cron=True)
+        order.whatsapp_message_id.unlink()
+        self.env['sale.order']._cron_send_pending_whatsapp()
+        self.assertEqual(order.whatsapp_send_state, 'failed')
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Benchmark: throughput of the bulk WhatsApp order-confirmation sender.
+
+Run it from ``odoo-bin shell -d <db>`` on a database with an approved
+auto-send template::
+
+    from odoo.addons.whatsapp_website_integration.tools import bench_bulk_send
+    bench_bulk_send.run(env)
+
+Orders are created and sent inside a savepoint that is rolled back afterwards.
+Messages are left to the WhatsApp queue (``force_send_by_cron``), so nothing
+reaches the provider: the figures measure the ORM work of the sender.
+"""
+import time
+
+from odoo import Command
+from odoo.exceptions import UserError
+
+SIZES = (100, 1000, 10000)
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _create_orders(env, count):
+    website = env['website'].search([], limit=1)
+    product = env['product.product'].create({
+        'name': 'WhatsApp bulk send benchmark',
+        'list_price': 10.0,
+    })
+    partners = env['res.partner'].create([
+        {'name': f'Bench Customer {i}', 'mobile': f'+1555{i:07d}'}
+        for i in range(count)
+    ])
+    return env['sale.order'].create([
+        {
+            'partner_id': partner.id,
+            'website_id': website.id,
+            'order_line': [Command.create({'product_id': product.id, 'product_uom_qty': 1})],
+        }
+        for partner in partners
+    ])
+
+
+def run(env, sizes=SIZES):
+    if not env['whatsapp.template'].get_order_confirmation_template():
+        raise UserError('The benchmark needs an approved auto-send WhatsApp template.')
+
+    results = {}
+    for size in sizes:
+        try:
+            with env.cr.savepoint():
+                orders = _create_orders(env, size)
+                env.flush_all()
+                env.invalidate_all()
+
+                queries_before = env.cr.sql_log_count
+                start = time.perf_counter()
+                sent = orders._send_order_confirmation_whatsapp_batch()
+                env.flush_all()
+                elapsed = time.perf_counter() - start
+
+                results[size] = {
+                    'sent': len(sent),
+                    'seconds': round(elapsed, 3),
+                    'orders_per_s': round(size / elapsed, 1),
+                    'queries_per_order': round((env.cr.sql_log_count - queries_before) / size, 2),
+                }
+                raise _Rollback()
+        except _Rollback:
+            env.invalidate_all()
+
+    for size, res in results.items():
+        print(
+            f"{size:>6} orders: {res['seconds']:>8}s  {res['orders_per_s']:>8} orders/s  "
+            f"{res['queries_per_order']:>6} queries/order  ({res['sent']} sent)"
+        )
+    return results
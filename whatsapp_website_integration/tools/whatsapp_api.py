@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Route the WhatsApp Business API client through the shared pooled session.
+
+``odoo.addons.whatsapp.tools.whatsapp_api`` calls ``requests.request`` for
+every message, opening a new connection to graph.facebook.com each time.
+Calls made by ``WhatsAppApi`` for a database where this module is installed
+reuse the keep-alive connections of ``ih_graph_api`` instead; message sends
+are also paced per phone number id and retried when Meta throttles them (see
+``ih_graph_api.tools.rate_limit``).
+
+The ``whatsapp`` module is loaded once per process for all its databases:
+calls made for the other databases go to ``requests`` unchanged.
+"""
+import logging
+import re
+import threading
+
+import requests
+
+from odoo.addons.ih_graph_api.tools import rate_limit
+from odoo.addons.whatsapp.tools import whatsapp_api
+
+_logger = logging.getLogger(__name__)
+
+_MESSAGES_URL = re.compile(r'/(?P<phone_uid>[^/]+)/messages/?(?:\?|$)')
+# Set while WhatsAppApi calls Meta for a database where this module is installed
+_scope = threading.local()
+
+
+def _phone_number_id(url):
+    match = _MESSAGES_URL.search(url)
+    return match and match['phone_uid']
+
+
+class ScopedThrottledRequests(rate_limit.ThrottledRequests):
+    """:class:`ThrottledRequests` applied only inside :func:`_api_requests`."""
+
+    def request(self, method, url, **kwargs):
+        if getattr(_scope, 'active', False):
+            return super().request(method, url, **kwargs)
+        return requests.request(method, url, **kwargs)
+
+
+_original_api_requests = getattr(whatsapp_api.WhatsAppApi, '_WhatsAppApi__api_requests', None)
+
+
+def _api_requests(self, *args, **kwargs):
+    registry = self.wa_account_id.env.registry
+    if 'whatsapp_website_integration' not in registry._init_modules:
+        return _original_api_requests(self, *args, **kwargs)
+    previous, _scope.active = getattr(_scope, 'active', False), True
+    try:
+        return _original_api_requests(self, *args, **kwargs)
+    finally:
+        _scope.active = previous
+
+
+if _original_api_requests is None or whatsapp_api.requests is not requests:
+    # Upstream renamed the method or its import: keep its behavior untouched
+    _logger.warning(
+        "odoo.addons.whatsapp.tools.whatsapp_api changed: WhatsApp calls are not pooled nor throttled"
+    )
+else:
+    whatsapp_api.WhatsAppApi._WhatsAppApi__api_requests = _api_requests
+    whatsapp_api.requests = ScopedThrottledRequests('whatsapp', _phone_number_id)